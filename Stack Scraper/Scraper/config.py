@@ -36,11 +36,17 @@ class ScrapingConfig:
     # Threading and concurrency
     max_workers: int = config('MAX_WORKERS', default=5, cast=int)
     questions_per_worker: int = config('QUESTIONS_PER_WORKER', default=100, cast=int)
+    task_prefetch: int = config('TASK_PREFETCH', default=16, cast=int)
     
     # Rate limiting
     min_delay: float = config('MIN_DELAY', default=2.0, cast=float)
     max_delay: float = config('MAX_DELAY', default=5.0, cast=float)
     
+    # Event-loop workers fetch pages over HTTP; disable to drive Chrome from threads
+    async_workers: bool = config('ASYNC_WORKERS', default=True, cast=bool)
+    http_connection_limit: int = config('HTTP_CONNECTION_LIMIT', default=500, cast=int)
+    http_connections_per_host: int = config('HTTP_CONNECTIONS_PER_HOST', default=20, cast=int)
+    
     # Browser configuration
     headless: bool = config('HEADLESS', default=True, cast=bool)
     timeout: int = config('TIMEOUT', default=30, cast=int)
@@ -86,8 +92,14 @@ class Config:
         # Target configuration
         self.target_total_questions = config('TARGET_QUESTIONS', default=100000, cast=int)
         
+        # Number of Redis lists the pending task queue is sharded across
+        self.task_queue_shards = config('TASK_QUEUE_SHARDS', default=16, cast=int)
+        
         # Duplicate detection
         self.duplicate_check_batch_size = config('DUPLICATE_BATCH_SIZE', default=1000, cast=int)
+        self.bloom_capacity = config('BLOOM_CAPACITY', default=1000000, cast=int)
+        self.bloom_error_rate = config('BLOOM_ERROR_RATE', default=0.001, cast=float)
+        self.bloom_filter_dir = config('BLOOM_FILTER_DIR', default='/tmp')
         
         # Security
         self.shutdown_key = config('SHUTDOWN_KEY', default='secure-key-change-me')
@@ -0,0 +1,60 @@
+"""
+Shared pytest fixtures for the Stack Overflow scraper tests
+"""
+
+import shutil
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+
+def _test_chrome_options() -> Options:
+    """Chrome options shared by every browser the tests start"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    
+    # Return from driver.get at DOMContentLoaded and skip everything the tests never read
+    chrome_options.page_load_strategy = "eager"
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-translate")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    return chrome_options
+
+
+def create_test_driver(service: Service = None) -> webdriver.WebDriver:
+    """Start the headless Chrome used by the browser tests, on an already running chromedriver if given"""
+    if service is not None:
+        return webdriver.Remote(command_executor=service.service_url, options=_test_chrome_options())
+    return webdriver.Chrome(options=_test_chrome_options())
+
+
+@pytest.fixture(scope="session")
+def chromedriver_service():
+    """One chromedriver process per test worker, or None to let Selenium locate and spawn it"""
+    executable = shutil.which("chromedriver")
+    if executable is None:
+        yield None
+        return
+    
+    service = Service(executable_path=executable)
+    service.start()
+    yield service
+    service.stop()
+
+
+@pytest.fixture(scope="session")
+def shared_driver(chromedriver_service):
+    """One Chrome for the whole test session, so browser startup is paid once"""
+    driver = create_test_driver(chromedriver_service)
+    yield driver
+    driver.quit()
@@ -6,8 +6,8 @@ Handles persistent storage to MongoDB with duplicate detection and data integrit
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-import json
 import threading
+import orjson
 from config import CONFIG
 
 try:
@@ -319,16 +319,20 @@ class DataStorage:
                 if limit:
                     cursor = cursor.limit(limit)
                 
-                questions = []
-                for question in cursor:
-                    # Convert ObjectId to string
-                    question['_id'] = str(question['_id'])
-                    questions.append(question)
+                # Stream documents straight from the cursor through a 1 MB write buffer
+                exported = 0
+                with open(filename, 'wb', buffering=1024 * 1024) as f:
+                    f.write(b"[")
+                    for question in cursor:
+                        # Convert ObjectId to string
+                        question['_id'] = str(question['_id'])
+                        
+                        f.write(b",\n" if exported else b"\n")
+                        f.write(orjson.dumps(question, default=str, option=orjson.OPT_INDENT_2))
+                        exported += 1
+                    f.write(b"\n]\n")
                 
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(questions, f, indent=2, ensure_ascii=False, default=str)
-                
-                logger.info(f"Exported {len(questions)} questions to {filename}")
+                logger.info(f"Exported {exported} questions to {filename}")
                 return filename
                 
         except Exception as e:
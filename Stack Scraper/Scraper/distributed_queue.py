@@ -3,19 +3,83 @@ Distributed Task Queue System for Stack Overflow Scraper
 Handles job distribution, duplicate detection, and coordination across instances
 """
 
+import os
 import redis
 import json
 import hashlib
+import zlib
 import time
 import random
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import logging
 from config import CONFIG
 
+try:
+    from pybloomfilter import BloomFilter
+    BLOOMFILTER_AVAILABLE = True
+except ImportError:
+    BLOOMFILTER_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Atomically moves up to ARGV[1] tasks from the pending to the processing queue
+CLAIM_TASKS_SCRIPT = """
+local tasks = {}
+for i = 1, tonumber(ARGV[1]) do
+    local task = redis.call('RPOPLPUSH', KEYS[1], KEYS[2])
+    if not task then
+        break
+    end
+    tasks[i] = task
+end
+return tasks
+"""
+
+
+def _create_local_filter(name: str):
+    """Create a per-host membership filter that shadows a remote Redis set"""
+    if BLOOMFILTER_AVAILABLE:
+        filename = os.path.join(CONFIG.bloom_filter_dir, f"scraper_{name}.bf")
+        try:
+            return _open_shared_bloom_filter(filename)
+        except Exception as e:
+            logger.warning(f"Could not open bloom filter {filename}, using in-memory set: {e}")
+    
+    # Exact fallback: no false positives, but grows with the number of entries
+    return set()
+
+
+def _open_shared_bloom_filter(filename: str):
+    """Open the host's bloom filter file, creating it atomically if no process has yet"""
+    if os.path.exists(filename):
+        return BloomFilter.open(filename)
+    
+    # Build under a private name and link it into place, so worker processes starting at
+    # once never initialise the same file; the loser opens the winner's filter instead
+    private = f"{filename}.{os.getpid()}"
+    bloom = BloomFilter(CONFIG.bloom_capacity, CONFIG.bloom_error_rate, private)
+    try:
+        os.link(private, filename)
+    except FileExistsError:
+        bloom = BloomFilter.open(filename)
+    finally:
+        os.unlink(private)
+    return bloom
+
+
+# Shared connection pool so every Redis client reuses the same keep-alive connections
+redis_pool = redis.ConnectionPool(
+    host=CONFIG.redis.host,
+    port=CONFIG.redis.port,
+    password=CONFIG.redis.password,
+    db=CONFIG.redis.db,
+    decode_responses=True,
+    max_connections=CONFIG.redis.max_connections,
+    socket_keepalive=True
+)
+
 
 @dataclass
 class ScrapingTask:
@@ -35,17 +99,11 @@ class DistributedTaskQueue:
     """Redis-based distributed task queue for coordinating scraping across instances"""
     
     def __init__(self):
-        self.redis_client = redis.Redis(
-            host=CONFIG.redis.host,
-            port=CONFIG.redis.port,
-            password=CONFIG.redis.password,
-            db=CONFIG.redis.db,
-            decode_responses=True,
-            max_connections=CONFIG.redis.max_connections
-        )
-        
-        # Queue names
+        self.redis_client = redis.Redis(connection_pool=redis_pool)
+        
+        # Queue names; pending tasks are spread across shards to avoid a single hot list
         self.task_queue = "scraping_tasks"
+        self.task_shards = [f"{self.task_queue}:shard:{i}" for i in range(CONFIG.task_queue_shards)]
         self.processing_queue = "processing_tasks"
         self.completed_queue = "completed_tasks"
         self.failed_queue = "failed_tasks"
@@ -54,19 +112,26 @@ class DistributedTaskQueue:
         self.url_set = "scraped_urls"
         self.question_ids = "question_ids"
         
+        # Local shadows of the duplicate sets; only a local hit needs a Redis round-trip
+        self._url_filter = _create_local_filter("url")
+        self._question_filter = _create_local_filter("qid")
+        
         # Worker tracking
         self.active_workers = "active_workers"
         self.worker_heartbeat = "worker_heartbeat"
         
         # Statistics
         self.stats_key = "scraping_stats"
+        self.progress_channel = "scraping_progress"
+        
+        self._claim_tasks = self.redis_client.register_script(CLAIM_TASKS_SCRIPT)
     
     def initialize_task_distribution(self, total_pages: int = 10000) -> None:
         """Initialize the task queue with URL ranges for scraping"""
         logger.info(f"Initializing task distribution for {total_pages} pages")
         
         # Clear existing tasks
-        self.redis_client.delete(self.task_queue)
+        self.redis_client.delete(self.task_queue, *self.task_shards)
         
         # Create page ranges for different SO sections
         so_sections = [
@@ -100,8 +165,8 @@ class DistributedTaskQueue:
                     created_at=datetime.now()
                 )
                 
-                # Add task to queue
-                self.redis_client.lpush(self.task_queue, json.dumps(asdict(task), default=str))
+                # Add task to its shard
+                self.redis_client.lpush(self._shard_for(task.task_id), json.dumps(asdict(task), default=str))
                 task_counter += 1
         
         logger.info(f"Created {task_counter} scraping tasks")
@@ -116,53 +181,110 @@ class DistributedTaskQueue:
             "start_time": datetime.now().isoformat()
         })
     
-    def get_next_task(self, worker_id: str) -> Optional[ScrapingTask]:
-        """Get the next available task for a worker"""
+    def _shard_for(self, task_id: str) -> str:
+        """Pending-queue shard that a task always returns to"""
+        return self.task_shards[zlib.crc32(task_id.encode()) % len(self.task_shards)]
+    
+    def get_next_task(self, worker_id: str, block: bool = True) -> Optional[ScrapingTask]:
+        """Get the next available task for a worker, optionally waiting up to 30s for one"""
+        deadline = time.time() + 30
+        
+        while True:
+            tasks = self.get_next_tasks(worker_id, 1)
+            if tasks or not block or time.time() >= deadline:
+                return tasks[0] if tasks else None
+            time.sleep(1)
+    
+    def get_next_tasks(self, worker_id: str, count: int) -> List[ScrapingTask]:
+        """Claim up to `count` tasks for a worker, from its own shard first"""
         try:
-            # Atomic operation: move task from pending to processing
-            task_data = self.redis_client.brpoplpush(
-                self.task_queue, 
-                self.processing_queue,
-                timeout=30
-            )
+            # Start with the worker's home shard, then steal from the others in random order
+            home = zlib.crc32(worker_id.encode()) % len(self.task_shards)
+            others = self.task_shards[:home] + self.task_shards[home + 1:]
+            random.shuffle(others)
             
-            if not task_data:
-                return None
+            claimed = []
+            for shard in [self.task_shards[home]] + others:
+                claimed = self._claim_tasks(keys=[shard, self.processing_queue], args=[count])
+                if claimed:
+                    break
             
-            task_dict = json.loads(task_data)
-            task = ScrapingTask(**task_dict)
-            task.worker_id = worker_id
-            task.status = 'running'
+            if not claimed:
+                return []
             
-            # Update task in processing queue
-            self.redis_client.lrem(self.processing_queue, 1, task_data)
-            self.redis_client.lpush(self.processing_queue, json.dumps(asdict(task), default=str))
+            tasks = []
+            pipe = self.redis_client.pipeline(transaction=False)
+            
+            for task_data in claimed:
+                task = ScrapingTask(**json.loads(task_data))
+                task.worker_id = worker_id
+                task.status = 'running'
+                
+                # Update task in processing queue
+                pipe.lrem(self.processing_queue, 1, task_data)
+                pipe.lpush(self.processing_queue, json.dumps(asdict(task), default=str))
+                tasks.append(task)
             
             # Register worker heartbeat
-            self.register_worker_heartbeat(worker_id)
+            pipe.hset(self.worker_heartbeat, worker_id, datetime.now().isoformat())
+            pipe.sadd(self.active_workers, worker_id)
+            pipe.execute()
             
-            logger.info(f"Assigned task {task.task_id} to worker {worker_id}")
-            return task
+            logger.info(f"Assigned {len(tasks)} tasks to worker {worker_id}")
+            return tasks
             
         except Exception as e:
-            logger.error(f"Error getting next task: {e}")
-            return None
+            logger.error(f"Error getting next tasks: {e}")
+            return []
+    
+    def release_tasks(self, tasks: List[ScrapingTask]) -> None:
+        """Return claimed but unstarted tasks to the front of the pending queue"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        
+        for task in tasks:
+            pipe.lrem(self.processing_queue, 1, json.dumps(asdict(task), default=str))
+            
+            task.worker_id = ""
+            task.status = 'pending'
+            pipe.rpush(self._shard_for(task.task_id), json.dumps(asdict(task), default=str))
+        
+        pipe.execute()
+        logger.info(f"Released {len(tasks)} unstarted tasks back to the queue")
     
     def complete_task(self, task: ScrapingTask, questions_scraped: int) -> None:
         """Mark a task as completed"""
-        task.status = 'completed'
-        task.questions_scraped = questions_scraped
+        self.complete_tasks([(task, questions_scraped)])
+    
+    def complete_tasks(self, results: List[Tuple[ScrapingTask, int]]) -> None:
+        """Mark a batch of tasks as completed in a single round-trip"""
+        if not results:
+            return
         
-        # Remove from processing and add to completed
-        task_data = json.dumps(asdict(task), default=str)
-        self.redis_client.lrem(self.processing_queue, 1, task_data)
-        self.redis_client.lpush(self.completed_queue, task_data)
+        pipe = self.redis_client.pipeline(transaction=False)
+        total_questions = 0
         
-        # Update statistics
-        self.redis_client.hincrby(self.stats_key, "completed_tasks", 1)
-        self.redis_client.hincrby(self.stats_key, "total_questions", questions_scraped)
+        for task, questions_scraped in results:
+            # Processing entries were stored while the task was running, so match that form
+            processing_data = json.dumps(asdict(task), default=str)
+            
+            task.status = 'completed'
+            task.questions_scraped = questions_scraped
+            total_questions += questions_scraped
+            
+            # Remove from processing and add to completed
+            pipe.lrem(self.processing_queue, 1, processing_data)
+            pipe.lpush(self.completed_queue, json.dumps(asdict(task), default=str))
+            
+            # Wake up anyone monitoring progress
+            pipe.publish(self.progress_channel, questions_scraped)
         
-        logger.info(f"Task {task.task_id} completed with {questions_scraped} questions")
+        # Update statistics once for the whole batch
+        pipe.hincrby(self.stats_key, "completed_tasks", len(results))
+        pipe.hincrby(self.stats_key, "total_questions", total_questions)
+        pipe.execute()
+        
+        for task, questions_scraped in results:
+            logger.info(f"Task {task.task_id} completed with {questions_scraped} questions")
     
     def fail_task(self, task: ScrapingTask, error: str) -> None:
         """Mark a task as failed and potentially retry"""
@@ -172,7 +294,7 @@ class DistributedTaskQueue:
             # Retry task - put back in queue
             task.status = 'pending'
             task.worker_id = ""
-            self.redis_client.lpush(self.task_queue, json.dumps(asdict(task), default=str))
+            self.redis_client.lpush(self._shard_for(task.task_id), json.dumps(asdict(task), default=str))
             logger.info(f"Task {task.task_id} failed, retrying ({task.retries}/{CONFIG.scraping.max_retries})")
         else:
             # Mark as permanently failed
@@ -185,24 +307,48 @@ class DistributedTaskQueue:
         # Remove from processing queue
         self.redis_client.lrem(self.processing_queue, 1, json.dumps(asdict(task), default=str))
     
+    def subscribe_progress(self) -> redis.client.PubSub:
+        """Subscribe to task completion events; each message carries the task's question count"""
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.progress_channel)
+        return pubsub
+    
     def is_duplicate_url(self, url: str) -> bool:
-        """Check if a URL has already been scraped"""
+        """Check if a URL has already been scraped by this host
+        
+        A local miss skips Redis entirely; pages first scraped by other
+        workers are caught by the return value of add_scraped_url.
+        """
         url_hash = hashlib.md5(url.encode()).hexdigest()
+        if url_hash not in self._url_filter:
+            return False
         return self.redis_client.sismember(self.url_set, url_hash)
     
-    def add_scraped_url(self, url: str) -> None:
-        """Mark a URL as scraped"""
+    def add_scraped_url(self, url: str) -> bool:
+        """Mark a URL as scraped, returning False if it was already known"""
         url_hash = hashlib.md5(url.encode()).hexdigest()
-        self.redis_client.sadd(self.url_set, url_hash)
+        self._url_filter.add(url_hash)
+        return bool(self.redis_client.sadd(self.url_set, url_hash))
     
     def is_duplicate_question(self, question_id: str) -> bool:
-        """Check if a question ID has already been scraped"""
+        """Check if a question ID has already been scraped by this host
+        
+        A local miss skips Redis entirely; questions first seen by other
+        workers are caught by the return value of add_question_id.
+        """
+        if question_id not in self._question_filter:
+            return False
         return self.redis_client.sismember(self.question_ids, question_id)
     
-    def add_question_id(self, question_id: str) -> None:
-        """Mark a question ID as scraped"""
-        self.redis_client.sadd(self.question_ids, question_id)
+    def add_question_id(self, question_id: str) -> bool:
+        """Mark a question ID as scraped, returning False if it was already known"""
+        self._question_filter.add(question_id)
+        
+        if not self.redis_client.sadd(self.question_ids, question_id):
+            return False
+        
         self.redis_client.hincrby(self.stats_key, "unique_questions", 1)
+        return True
     
     def register_worker_heartbeat(self, worker_id: str) -> None:
         """Register that a worker is alive"""
@@ -240,22 +386,29 @@ class DistributedTaskQueue:
                     task_dict['status'] = 'pending'
                     
                     self.redis_client.lrem(self.processing_queue, 1, task_data)
-                    self.redis_client.lpush(self.task_queue, json.dumps(task_dict))
+                    self.redis_client.lpush(self._shard_for(task_dict['task_id']), json.dumps(task_dict))
                     
                     logger.info(f"Reassigned task {task_dict['task_id']} from dead worker {dead_worker_id}")
             except Exception as e:
                 logger.error(f"Error reassigning task: {e}")
     
     def get_stats(self) -> Dict:
-        """Get current scraping statistics"""
-        stats = self.redis_client.hgetall(self.stats_key)
+        """Get current scraping statistics in a single round-trip"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hgetall(self.stats_key)
+        pipe.llen(self.processing_queue)
+        pipe.scard(self.active_workers)
+        pipe.scard(self.url_set)
+        for shard in self.task_shards:
+            pipe.llen(shard)
+        stats, processing, active_workers, scraped_urls, *shard_lengths = pipe.execute()
         
         # Add real-time counts
         stats.update({
-            "pending_tasks": self.redis_client.llen(self.task_queue),
-            "processing_tasks": self.redis_client.llen(self.processing_queue),
-            "active_workers": self.redis_client.scard(self.active_workers),
-            "scraped_urls": self.redis_client.scard(self.url_set),
+            "pending_tasks": sum(shard_lengths),
+            "processing_tasks": processing,
+            "active_workers": active_workers,
+            "scraped_urls": scraped_urls,
             "current_time": datetime.now().isoformat()
         })
         
@@ -274,7 +427,7 @@ class DistributedTaskQueue:
                 task_dict['status'] = 'pending'
                 
                 self.redis_client.lrem(self.processing_queue, 1, task_data)
-                self.redis_client.lpush(self.task_queue, json.dumps(task_dict))
+                self.redis_client.lpush(self._shard_for(task_dict['task_id']), json.dumps(task_dict))
             except Exception as e:
                 logger.error(f"Error during shutdown cleanup: {e}")
 
@@ -1,23 +1,28 @@
 """
 Multithreaded Stack Overflow Scraper Worker
-Enhanced version of the original scraper with threading and distributed coordination
+Enhanced version of the original scraper with threading and distributed coordination.
+Workers can also run as asyncio coroutines that fetch pages over HTTP instead of Chrome.
 """
 
+import asyncio
+import itertools
+import os
+import sys
 import threading
 import queue
 import time
 import random
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Optional
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import json
-import re
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
@@ -25,8 +30,44 @@ from config import CONFIG
 from distributed_queue import task_queue, ScrapingTask
 from data_storage import DataStorage
 
+try:
+    import aiohttp
+    from page_parser import parse_question_list, parse_question_page
+    ASYNC_FETCH_AVAILABLE = True
+except ImportError:
+    ASYNC_FETCH_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Maximum time a single task may run before it is reported as failed
+TASK_TIMEOUT = 300  # 5 minutes
+
+# Question summaries across current and legacy listing layouts
+QUESTION_SUMMARY_SELECTOR = ".s-post-summary, div[data-post-id], .question-summary"
+
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+_user_agent_cycle = itertools.cycle(USER_AGENTS)
+_user_agent_lock = threading.Lock()
+
+# Question title anchors across listing layouts, tried in order
+QUESTION_TITLE_SELECTORS = (
+    "h3.s-post-summary--content-title a",
+    ".s-post-summary--content h3 a",
+    "a.s-link",
+)
+
+# Question author links, tried in order
+QUESTION_AUTHOR_SELECTORS = (
+    ".s-user-card--link",
+)
+
+# Reads a title anchor's title and href in a single WebDriver round-trip
+TITLE_LINK_JS = "const a = arguments[0]; return [a.title || a.innerText.trim(), a.href];"
+
 
 class ThreadSafeStackOverflowScraper:
     """Thread-safe version of the Stack Overflow scraper"""
@@ -71,13 +112,10 @@ class ThreadSafeStackOverflowScraper:
         chrome_options.add_argument("--memory-pressure-off")
         chrome_options.add_argument("--max_old_space_size=4096")
         
-        # Random user agent for better stealth
-        user_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        ]
-        chrome_options.add_argument(f"--user-agent={random.choice(user_agents)}")
+        # Rotate user agents across drivers; each driver keeps one for its lifetime
+        with _user_agent_lock:
+            user_agent = next(_user_agent_cycle)
+        chrome_options.add_argument(f"--user-agent={user_agent}")
         
         chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
         chrome_options.add_experimental_option('useAutomationExtension', False)
@@ -94,14 +132,21 @@ class ThreadSafeStackOverflowScraper:
             logger.error(f"Failed to initialize Chrome driver: {str(e)}")
             raise WebDriverException(f"Failed to initialize Chrome driver: {str(e)}")
     
-    def extract_question_id_from_url(self, url: str) -> Optional[str]:
+    @staticmethod
+    def extract_question_id_from_url(url: str) -> Optional[str]:
         """Extract question ID from Stack Overflow URL"""
-        try:
-            # Pattern: /questions/{question_id}/...
-            match = re.search(r'/questions/(\d+)/', url)
-            return match.group(1) if match else None
-        except Exception:
+        # Pattern: /questions/{question_id}/...
+        start = url.find('/questions/')
+        if start < 0:
             return None
+        start += len('/questions/')
+        
+        end = url.find('/', start)
+        if end < 0:
+            return None
+        
+        question_id = url[start:end]
+        return question_id if question_id.isdigit() else None
     
     def scrape_questions_from_page(self, url: str) -> List[Dict]:
         """Scrape questions from a single page"""
@@ -122,25 +167,16 @@ class ThreadSafeStackOverflowScraper:
             delay = random.uniform(CONFIG.scraping.min_delay, CONFIG.scraping.max_delay)
             time.sleep(delay)
             
-            # Wait for questions to load
+            # Wait for questions to load, accepting any of the known layouts under one timeout
             wait = WebDriverWait(driver, CONFIG.scraping.timeout)
             
-            # Try multiple selectors for questions
-            question_selectors = [
-                ".s-post-summary",
-                "div[data-post-id]", 
-                ".question-summary"
-            ]
-            
             questions = None
-            for selector in question_selectors:
-                try:
-                    questions = wait.until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                    )
-                    break
-                except TimeoutException:
-                    continue
+            try:
+                questions = wait.until(
+                    lambda d: d.find_elements(By.CSS_SELECTOR, QUESTION_SUMMARY_SELECTOR) or False
+                )
+            except TimeoutException:
+                pass
             
             if not questions:
                 logger.warning(f"[{self.worker_id}] No questions found on page: {url}")
@@ -148,9 +184,12 @@ class ThreadSafeStackOverflowScraper:
             
             logger.info(f"[{self.worker_id}] Found {len(questions)} questions on page")
             
+            # One timestamp for the whole page rather than one per question
+            page_timestamp = datetime.now().isoformat()
+            
             for i, question_element in enumerate(questions):
                 try:
-                    question_data = self._extract_question_data_fast(question_element, i + 1)
+                    question_data = self._extract_question_data_fast(question_element, i + 1, page_timestamp)
                     
                     if not question_data or not question_data.get('link'):
                         continue
@@ -160,13 +199,11 @@ class ThreadSafeStackOverflowScraper:
                     if not question_id:
                         continue
                     
-                    # Skip if already scraped
-                    if task_queue.is_duplicate_question(question_id):
+                    # Skip if already scraped (the add is atomic, so it also catches other workers)
+                    if task_queue.is_duplicate_question(question_id) or not task_queue.add_question_id(question_id):
                         logger.debug(f"[{self.worker_id}] Duplicate question {question_id}, skipping")
                         continue
                     
-                    # Add question ID to prevent duplicates
-                    task_queue.add_question_id(question_id)
                     question_data['question_id'] = question_id
                     
                     # Scrape full content (with rate limiting)
@@ -184,8 +221,9 @@ class ThreadSafeStackOverflowScraper:
                     logger.error(f"[{self.worker_id}] Error extracting question {i + 1}: {str(e)}")
                     continue
             
-            # Mark URL as scraped
-            task_queue.add_scraped_url(url)
+            # Mark URL as scraped; a page another worker already finished yields only duplicate questions
+            if not task_queue.add_scraped_url(url):
+                logger.info(f"[{self.worker_id}] URL already scraped by another worker: {url}")
             
             return questions_data
             
@@ -193,64 +231,52 @@ class ThreadSafeStackOverflowScraper:
             logger.error(f"[{self.worker_id}] Error scraping page {url}: {str(e)}")
             return questions_data
     
-    def _extract_question_data_fast(self, question_element, index: int) -> Optional[Dict]:
+    def _extract_question_data_fast(self, question_element, index: int, scraped_at: str) -> Optional[Dict]:
         """Fast extraction of basic question data"""
         try:
-            # Extract title and link
-            title_selectors = [
-                "h3.s-post-summary--content-title a",
-                ".s-post-summary--content h3 a",
-                "a.s-link"
-            ]
+            # The stats cells are always votes, answers, views
+            stats = question_element.find_elements(By.CSS_SELECTOR, ".s-post-summary--stats-item-number")
+            
+            def stat_text(position: int) -> str:
+                return stats[position].text.strip() if position < len(stats) else "0"
+            
+            # Skip questions without answers before paying for any other lookups
+            answers = stat_text(1)
+            try:
+                if int(answers) == 0:
+                    return None
+            except (ValueError, TypeError):
+                # If answers is not a valid number, skip this question
+                return None
             
+            # Extract title and link
             title = "N/A"
             link = "N/A"
             
-            for selector in title_selectors:
+            for selector in QUESTION_TITLE_SELECTORS:
                 try:
                     title_element = question_element.find_element(By.CSS_SELECTOR, selector)
-                    title = title_element.get_attribute("title") or title_element.text.strip()
-                    link = title_element.get_attribute("href")
+                    title, link = self.get_driver().execute_script(TITLE_LINK_JS, title_element)
                     break
-                except:
+                except WebDriverException:  # Includes NoSuchElementException
                     continue
             
             if link == "N/A":
                 return None
             
-            # Extract metadata quickly
-            votes = self._safe_extract_text(question_element, [
-                ".s-post-summary--stats-item-number"
-            ], "0")
-            
-            answers = self._safe_extract_text(question_element, [
-                ".s-post-summary--stats-item:nth-child(2) .s-post-summary--stats-item-number"
-            ], "0")
-            
-            # Skip questions without answers
-            try:
-                if int(answers) == 0:
-                    return None
-            except (ValueError, TypeError):
-                # If answers is not a valid number, skip this question
-                return None
-            
-            views = self._safe_extract_text(question_element, [
-                ".s-post-summary--stats-item:nth-child(3) .s-post-summary--stats-item-number"
-            ], "0")
+            votes = stat_text(0)
+            views = stat_text(2)
             
             # Extract tags
             tags = []
             try:
                 tag_elements = question_element.find_elements(By.CSS_SELECTOR, ".s-tag")
                 tags = [tag.text.strip() for tag in tag_elements[:5]]  # Limit to first 5 tags
-            except:
+            except WebDriverException:
                 pass
             
             # Extract author
-            author = self._safe_extract_text(question_element, [
-                ".s-user-card--link"
-            ], "Anonymous")
+            author = self._safe_extract_text(question_element, QUESTION_AUTHOR_SELECTORS, "Anonymous")
             
             return {
                 "index": index,
@@ -261,7 +287,7 @@ class ThreadSafeStackOverflowScraper:
                 "views": views,
                 "tags": tags,
                 "author": author,
-                "scraped_at": datetime.now().isoformat(),
+                "scraped_at": scraped_at,
                 "worker_id": self.worker_id
             }
             
@@ -330,15 +356,16 @@ class ThreadSafeStackOverflowScraper:
         
         return full_data
     
-    def _safe_extract_text(self, parent_element, selectors: List[str], default: str = "N/A") -> str:
+    def _safe_extract_text(self, parent_element, selectors, default: str = "N/A") -> str:
         """Safely extract text using multiple selectors"""
         for selector in selectors:
             try:
                 element = parent_element.find_element(By.CSS_SELECTOR, selector)
-                text = element.text.strip() or element.get_attribute('textContent').strip()
+                # textContent skips the layout pass behind element.text, which is only the fallback
+                text = (element.get_attribute('textContent') or '').strip() or element.text.strip()
                 if text:
                     return text
-            except:
+            except WebDriverException:  # Includes NoSuchElementException
                 continue
         return default
     
@@ -356,10 +383,17 @@ class DistributedScrapingWorker:
     
     def __init__(self, worker_id: str = None):
         self.worker_id = worker_id or f"worker-{CONFIG.worker_id}-{random.randint(1000, 9999)}"
-        self.scrapers = {}  # Thread ID -> Scraper instance
-        self.is_running = False
+        self._thread_local = threading.local()  # Holds each pool thread's scraper
+        self._scrapers = []  # Every scraper created, for cleanup
+        self._scrapers_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._stop_event.set()
         self.data_storage = DataStorage()
         
+        # Tasks claimed from the queue but not yet submitted to the thread pool
+        self._local_tasks = deque()
+        self._parse_pool = None
+        
         # Statistics
         self.total_questions_scraped = 0
         self.tasks_completed = 0
@@ -367,63 +401,270 @@ class DistributedScrapingWorker:
         
         logger.info(f"Initialized worker: {self.worker_id}")
     
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker loop is running and has not been asked to stop"""
+        return not self._stop_event.is_set()
+    
+    def stop(self) -> None:
+        """Ask the worker loop and any in-progress tasks to stop"""
+        self._stop_event.set()
+    
     def run_worker(self) -> None:
         """Main worker loop - processes tasks from the distributed queue"""
-        self.is_running = True
+        self._stop_event.clear()
         
         logger.info(f"[{self.worker_id}] Starting worker with {CONFIG.scraping.max_workers} threads")
         
+        # Future -> (task, deadline) for every task currently in the thread pool
+        in_flight = {}
+        
         with ThreadPoolExecutor(max_workers=CONFIG.scraping.max_workers) as executor:
-            while self.is_running:
+            while not self._stop_event.is_set():
                 try:
-                    # Get next task from queue
-                    task = task_queue.get_next_task(self.worker_id)
+                    # Top up the pool so every thread has a task, claiming tasks in batches
+                    while len(in_flight) < CONFIG.scraping.max_workers:
+                        if not self._local_tasks:
+                            self._local_tasks.extend(
+                                task_queue.get_next_tasks(self.worker_id, CONFIG.scraping.task_prefetch)
+                            )
+                        if not self._local_tasks:
+                            break
+                        
+                        task = self._local_tasks.popleft()
+                        future = executor.submit(self.process_task, task)
+                        in_flight[future] = (task, time.time() + TASK_TIMEOUT)
                     
-                    if not task:
+                    if not in_flight:
                         logger.info(f"[{self.worker_id}] No tasks available, waiting...")
-                        time.sleep(10)
+                        self._stop_event.wait(10)
                         continue
                     
-                    # Submit task to thread pool
-                    future = executor.submit(self.process_task, task)
+                    done, _ = wait(in_flight, timeout=1, return_when=FIRST_COMPLETED)
                     
-                    # Wait for task completion (with timeout)
-                    try:
-                        questions_scraped = future.result(timeout=300)  # 5 minute timeout per task
-                        task_queue.complete_task(task, questions_scraped)
-                        self.tasks_completed += 1
-                        self.total_questions_scraped += questions_scraped
-                        
-                        logger.info(f"[{self.worker_id}] Task {task.task_id} completed: {questions_scraped} questions")
-                        
-                    except Exception as e:
-                        logger.error(f"[{self.worker_id}] Task {task.task_id} failed: {str(e)}")
-                        task_queue.fail_task(task, str(e))
+                    self._finish_tasks([(in_flight.pop(future)[0], future) for future in done])
+                    
+                    # Give up on tasks that exceeded their time budget
+                    now = time.time()
+                    for future, (task, deadline) in list(in_flight.items()):
+                        if now > deadline:
+                            del in_flight[future]
+                            logger.error(f"[{self.worker_id}] Task {task.task_id} failed: timed out")
+                            task_queue.fail_task(task, "Task timed out")
                     
                     # Send heartbeat
-                    task_queue.register_worker_heartbeat(self.worker_id)
+                    if done:
+                        task_queue.register_worker_heartbeat(self.worker_id)
                     
                 except KeyboardInterrupt:
                     logger.info(f"[{self.worker_id}] Received interrupt signal, stopping...")
-                    self.is_running = False
+                    self.stop()
                     break
                     
                 except Exception as e:
                     logger.error(f"[{self.worker_id}] Unexpected error: {str(e)}")
-                    time.sleep(5)
+                    self._stop_event.wait(5)
+            
+            # Record the outcome of tasks that were still running when we stopped
+            wait(in_flight)
+            self._finish_tasks([(task, future) for future, (task, _) in in_flight.items()])
+        
+        # Hand prefetched tasks we never started to other workers
+        if self._local_tasks:
+            task_queue.release_tasks(list(self._local_tasks))
+            self._local_tasks.clear()
         
         self.cleanup_scrapers()
         logger.info(f"[{self.worker_id}] Worker stopped. Total questions scraped: {self.total_questions_scraped}")
     
+    def _finish_tasks(self, finished: List[Tuple[ScrapingTask, Future]]) -> None:
+        """Report finished tasks back to the distributed queue, acking successes as one batch"""
+        completed = []
+        
+        for task, future in finished:
+            try:
+                questions_scraped = future.result()
+            except Exception as e:
+                logger.error(f"[{self.worker_id}] Task {task.task_id} failed: {str(e)}")
+                task_queue.fail_task(task, str(e))
+                continue
+            
+            completed.append((task, questions_scraped))
+            self.tasks_completed += 1
+            self.total_questions_scraped += questions_scraped
+            
+            logger.info(f"[{self.worker_id}] Task {task.task_id} completed: {questions_scraped} questions")
+        
+        task_queue.complete_tasks(completed)
+    
+    async def run_worker_async(self, session: "aiohttp.ClientSession", parse_pool: Executor = None) -> None:
+        """Event-loop worker loop - fetches pages over HTTP instead of driving Chrome
+        
+        HTML parsing is handed to parse_pool when given so it does not stall the event loop.
+        """
+        self._stop_event.clear()
+        self._parse_pool = parse_pool
+        
+        logger.info(f"[{self.worker_id}] Starting async worker with {CONFIG.scraping.max_workers} concurrent tasks")
+        
+        # asyncio task -> scraping task for everything currently running
+        in_flight = {}
+        
+        while not self._stop_event.is_set():
+            try:
+                # Top up so max_workers tasks are always running, claiming tasks in batches
+                while len(in_flight) < CONFIG.scraping.max_workers:
+                    if not self._local_tasks:
+                        self._local_tasks.extend(await asyncio.to_thread(
+                            task_queue.get_next_tasks, self.worker_id, CONFIG.scraping.task_prefetch
+                        ))
+                    if not self._local_tasks:
+                        break
+                    
+                    task = self._local_tasks.popleft()
+                    coroutine = asyncio.wait_for(self.process_task_async(session, task), TASK_TIMEOUT)
+                    in_flight[asyncio.ensure_future(coroutine)] = task
+                
+                if not in_flight:
+                    logger.info(f"[{self.worker_id}] No tasks available, waiting...")
+                    await asyncio.sleep(10)
+                    continue
+                
+                done, _ = await asyncio.wait(in_flight, timeout=1, return_when=asyncio.FIRST_COMPLETED)
+                
+                await asyncio.to_thread(self._finish_tasks, [(in_flight.pop(future), future) for future in done])
+                
+                # Send heartbeat
+                if done:
+                    await asyncio.to_thread(task_queue.register_worker_heartbeat, self.worker_id)
+                
+            except Exception as e:
+                logger.error(f"[{self.worker_id}] Unexpected error: {str(e)}")
+                await asyncio.sleep(5)
+        
+        # Record the outcome of tasks that were still running when we stopped
+        if in_flight:
+            await asyncio.wait(in_flight)
+            await asyncio.to_thread(self._finish_tasks, [(task, future) for future, task in in_flight.items()])
+        
+        # Hand prefetched tasks we never started to other workers
+        if self._local_tasks:
+            await asyncio.to_thread(task_queue.release_tasks, list(self._local_tasks))
+            self._local_tasks.clear()
+        
+        logger.info(f"[{self.worker_id}] Worker stopped. Total questions scraped: {self.total_questions_scraped}")
+    
+    async def process_task_async(self, session: "aiohttp.ClientSession", task: ScrapingTask) -> int:
+        """Process a single scraping task on the event loop"""
+        questions_scraped = 0
+        
+        logger.info(f"[{self.worker_id}] Processing task {task.task_id}: pages {task.start_page}-{task.end_page}")
+        
+        # Generate URLs for the page range
+        base_url = task.url.split('?')[0]  # Remove existing query params
+        
+        for page in range(task.start_page, task.end_page + 1):
+            if self._stop_event.is_set():
+                break
+            
+            page_url = f"{base_url}?page={page}"
+            questions_data = await self.scrape_page_async(session, page_url)
+            
+            if questions_data:
+                # Store questions in database
+                await asyncio.to_thread(self.data_storage.store_questions_batch, questions_data)
+                questions_scraped += len(questions_data)
+                
+                logger.info(f"[{self.worker_id}] Page {page}: {len(questions_data)} questions")
+            
+            # Rate limiting between pages
+            await asyncio.sleep(random.uniform(CONFIG.scraping.min_delay, CONFIG.scraping.max_delay))
+        
+        return questions_scraped
+    
+    async def scrape_page_async(self, session: "aiohttp.ClientSession", url: str) -> List[Dict]:
+        """Fetch and parse a single listing page, including full content for a sample of questions"""
+        questions_data = []
+        
+        try:
+            logger.info(f"[{self.worker_id}] Scraping page: {url}")
+            
+            # Check if URL already scraped
+            if await asyncio.to_thread(task_queue.is_duplicate_url, url):
+                logger.info(f"[{self.worker_id}] URL already scraped, skipping: {url}")
+                return questions_data
+            
+            html = await self._fetch_html(session, url)
+            if html is None:
+                return questions_data
+            
+            candidates = await self._parse(parse_question_list, html, url, datetime.now().isoformat(), self.worker_id)
+            
+            for question_data in candidates:
+                question_id = ThreadSafeStackOverflowScraper.extract_question_id_from_url(question_data['link'])
+                if not question_id:
+                    continue
+                
+                # Skip if already scraped (the add is atomic, so it also catches other workers)
+                is_duplicate = await asyncio.to_thread(task_queue.is_duplicate_question, question_id)
+                if is_duplicate or not await asyncio.to_thread(task_queue.add_question_id, question_id):
+                    logger.debug(f"[{self.worker_id}] Duplicate question {question_id}, skipping")
+                    continue
+                
+                question_data['question_id'] = question_id
+                
+                # Scrape full content (with rate limiting)
+                if random.random() < 0.7:  # Only scrape full content for 70% of questions to speed up
+                    # A failed question page keeps its listing data rather than dropping the whole listing
+                    try:
+                        question_html = await self._fetch_html(session, question_data['link'])
+                        if question_html is not None:
+                            question_data.update(await self._parse(parse_question_page, question_html))
+                    except Exception as e:
+                        logger.error(f"Error scraping full content from {question_data['link']}: {str(e)}")
+                    
+                    # Small delay between question pages
+                    await asyncio.sleep(random.uniform(0.5, 1.5))
+                
+                questions_data.append(question_data)
+            
+            # Mark URL as scraped; a page another worker already finished yields only duplicate questions
+            if not await asyncio.to_thread(task_queue.add_scraped_url, url):
+                logger.info(f"[{self.worker_id}] URL already scraped by another worker: {url}")
+            
+        except Exception as e:
+            logger.error(f"[{self.worker_id}] Error scraping page {url}: {str(e)}")
+        
+        return questions_data
+    
+    async def _parse(self, parser, *args):
+        """Run a page parser in the parse pool, or inline if there is none"""
+        if self._parse_pool is None:
+            return parser(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._parse_pool, parser, *args)
+    
+    async def _fetch_html(self, session: "aiohttp.ClientSession", url: str) -> Optional[str]:
+        """Fetch a page's HTML, returning None on a non-200 response, timeout or connection error"""
+        try:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    logger.warning(f"[{self.worker_id}] HTTP {response.status} fetching {url}")
+                    return None
+                return await response.text()
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            logger.warning(f"[{self.worker_id}] Error fetching {url}: {str(e) or type(e).__name__}")
+            return None
+    
     def process_task(self, task: ScrapingTask) -> int:
         """Process a single scraping task"""
-        thread_id = threading.current_thread().ident
-        
         # Get or create scraper for this thread
-        if thread_id not in self.scrapers:
-            self.scrapers[thread_id] = ThreadSafeStackOverflowScraper(self.worker_id)
+        scraper = getattr(self._thread_local, 'scraper', None)
+        if scraper is None:
+            scraper = ThreadSafeStackOverflowScraper(self.worker_id)
+            self._thread_local.scraper = scraper
+            with self._scrapers_lock:
+                self._scrapers.append(scraper)
         
-        scraper = self.scrapers[thread_id]
         questions_scraped = 0
         
         try:
@@ -433,7 +674,7 @@ class DistributedScrapingWorker:
             base_url = task.url.split('?')[0]  # Remove existing query params
             
             for page in range(task.start_page, task.end_page + 1):
-                if not self.is_running:
+                if self._stop_event.is_set():
                     break
                 
                 page_url = f"{base_url}?page={page}"
@@ -446,9 +687,9 @@ class DistributedScrapingWorker:
                     
                     logger.info(f"[{self.worker_id}] Page {page}: {len(questions_data)} questions")
                 
-                # Rate limiting between pages
+                # Rate limiting between pages; returns immediately if the worker is stopped
                 delay = random.uniform(CONFIG.scraping.min_delay, CONFIG.scraping.max_delay)
-                time.sleep(delay)
+                self._stop_event.wait(delay)
             
         except Exception as e:
             logger.error(f"[{self.worker_id}] Error processing task {task.task_id}: {str(e)}")
@@ -458,9 +699,10 @@ class DistributedScrapingWorker:
     
     def cleanup_scrapers(self):
         """Clean up all scraper instances"""
-        for scraper in self.scrapers.values():
-            scraper.cleanup()
-        self.scrapers.clear()
+        with self._scrapers_lock:
+            for scraper in self._scrapers:
+                scraper.cleanup()
+            self._scrapers.clear()
     
     def get_worker_stats(self) -> Dict:
         """Get current worker statistics"""
@@ -473,10 +715,35 @@ class DistributedScrapingWorker:
             "runtime_minutes": runtime.total_seconds() / 60,
             "questions_per_minute": self.total_questions_scraped / (runtime.total_seconds() / 60) if runtime.total_seconds() > 0 else 0,
             "is_running": self.is_running,
-            "active_threads": len(self.scrapers)
+            "active_threads": len(self._scrapers)
         }
 
 
+def create_parse_pool() -> Executor:
+    """Pool for CPU-bound HTML parsing: processes under the GIL, threads on free-threaded builds"""
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    if gil_enabled:
+        # The pool starts after the Redis, logging and monitor threads, and forking a threaded
+        # process can hand a child a lock some other thread held; forkserver is not on Windows
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context(start_method))
+    return ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+async def run_async_workers(workers: List[DistributedScrapingWorker]) -> None:
+    """Run several workers on one event loop, sharing one HTTP connection pool and one parse pool"""
+    connector = aiohttp.TCPConnector(
+        limit=CONFIG.scraping.http_connection_limit,
+        limit_per_host=CONFIG.scraping.http_connections_per_host
+    )
+    timeout = aiohttp.ClientTimeout(total=CONFIG.scraping.timeout)
+    headers = {"User-Agent": random.choice(USER_AGENTS)}
+    
+    with create_parse_pool() as parse_pool:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            await asyncio.gather(*(worker.run_worker_async(session, parse_pool) for worker in workers))
+
+
 def main():
     """Main function to start a distributed scraping worker"""
     import sys
@@ -491,10 +758,13 @@ def main():
     worker = DistributedScrapingWorker(worker_id)
     
     try:
-        worker.run_worker()
+        if CONFIG.scraping.async_workers and ASYNC_FETCH_AVAILABLE:
+            asyncio.run(run_async_workers([worker]))
+        else:
+            worker.run_worker()
     except KeyboardInterrupt:
         logger.info("Shutting down worker...")
-        worker.is_running = False
+        worker.stop()
     except Exception as e:
         logger.error(f"Worker crashed: {str(e)}")
         raise
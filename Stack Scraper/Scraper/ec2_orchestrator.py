@@ -10,11 +10,19 @@ import json
 from typing import List, Dict, Optional
 from datetime import datetime
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from botocore.exceptions import ClientError, NoCredentialsError
 from config import CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Number of files uploaded to S3 in parallel when deploying code
+S3_UPLOAD_CONCURRENCY = 16
+
+# Largest instance count requested from a single run_instances call
+RUN_INSTANCES_BATCH_SIZE = 500
+
 
 class EC2Orchestrator:
     """Manages EC2 instances for distributed scraping"""
@@ -43,38 +51,15 @@ class EC2Orchestrator:
         # Key pair for SSH access (optional)
         key_name = self._ensure_key_pair()
         
+        instance_ids = []
+        
         try:
-            response = self.ec2_client.run_instances(
-                ImageId='ami-0abcdef1234567890',  # Ubuntu 22.04 LTS (update with current AMI)
-                MinCount=count,
-                MaxCount=count,
-                InstanceType=instance_type,
-                KeyName=key_name,
-                SecurityGroupIds=[security_group_id],
-                UserData=user_data_script,
-                IamInstanceProfile={
-                    'Name': 'StackOverflowScraperRole'  # IAM role for S3/CloudWatch access
-                },
-                TagSpecifications=[{
-                    'ResourceType': 'instance',
-                    'Tags': [
-                        {'Key': 'Name', 'Value': 'StackOverflow-Scraper'},
-                        {'Key': 'Project', 'Value': 'DistributedScraping'},
-                        {'Key': 'Environment', 'Value': 'production'},
-                        {'Key': 'AutoTerminate', 'Value': 'true'}
-                    ]
-                }],
-                BlockDeviceMappings=[{
-                    'DeviceName': '/dev/sda1',
-                    'Ebs': {
-                        'VolumeSize': 20,  # 20GB root volume
-                        'VolumeType': 'gp3',
-                        'DeleteOnTermination': True
-                    }
-                }]
-            )
-            
-            instance_ids = [instance['InstanceId'] for instance in response['Instances']]
+            # One run_instances call launches a whole batch; only very large requests are split
+            for batch_start in range(0, count, RUN_INSTANCES_BATCH_SIZE):
+                batch_size = min(RUN_INSTANCES_BATCH_SIZE, count - batch_start)
+                instance_ids.extend(self._run_instance_batch(
+                    batch_size, instance_type, user_data_script, security_group_id, key_name
+                ))
             
             logger.info(f"Launched {count} EC2 instances: {instance_ids}")
             
@@ -85,8 +70,52 @@ class EC2Orchestrator:
             
         except ClientError as e:
             logger.error(f"Error launching EC2 instances: {e}")
+            
+            # Earlier batches are already running and billing; nothing will track them after the raise
+            if instance_ids:
+                logger.warning(f"Terminating {len(instance_ids)} instances from completed batches: {instance_ids}")
+                try:
+                    self.terminate_instances(instance_ids)
+                except ClientError:
+                    logger.critical(f"Could not terminate orphaned instances, terminate manually: {instance_ids}")
             raise
     
+    def _run_instance_batch(self, count: int, instance_type: str, user_data_script: str,
+                            security_group_id: str, key_name: str) -> List[str]:
+        """Launch up to RUN_INSTANCES_BATCH_SIZE instances with a single API call"""
+        
+        response = self.ec2_client.run_instances(
+            ImageId='ami-0abcdef1234567890',  # Ubuntu 22.04 LTS (update with current AMI)
+            MinCount=count,
+            MaxCount=count,
+            InstanceType=instance_type,
+            KeyName=key_name,
+            SecurityGroupIds=[security_group_id],
+            UserData=user_data_script,
+            IamInstanceProfile={
+                'Name': 'StackOverflowScraperRole'  # IAM role for S3/CloudWatch access
+            },
+            TagSpecifications=[{
+                'ResourceType': 'instance',
+                'Tags': [
+                    {'Key': 'Name', 'Value': 'StackOverflow-Scraper'},
+                    {'Key': 'Project', 'Value': 'DistributedScraping'},
+                    {'Key': 'Environment', 'Value': 'production'},
+                    {'Key': 'AutoTerminate', 'Value': 'true'}
+                ]
+            }],
+            BlockDeviceMappings=[{
+                'DeviceName': '/dev/sda1',
+                'Ebs': {
+                    'VolumeSize': 20,  # 20GB root volume
+                    'VolumeType': 'gp3',
+                    'DeleteOnTermination': True
+                }
+            }]
+        )
+        
+        return [instance['InstanceId'] for instance in response['Instances']]
+    
     def _generate_user_data_script(self) -> str:
         """Generate user data script for instance initialization"""
         
@@ -444,27 +473,43 @@ echo "Stack Overflow Scraper instance setup completed" >> /var/log/user-data.log
         
         import os
         
-        try:
-            for root, dirs, files in os.walk(local_path):
-                for file in files:
-                    if file.endswith(('.py', '.txt', '.json', '.md')):
-                        local_file = os.path.join(root, file)
-                        s3_key = f"scraper-code/{os.path.relpath(local_file, local_path)}"
-                        
-                        self.s3_client.upload_file(local_file, CONFIG.aws.s3_bucket, s3_key)
-                        logger.info(f"Uploaded {local_file} to s3://{CONFIG.aws.s3_bucket}/{s3_key}")
-            
-            logger.info("Code upload to S3 completed")
+        uploads = []
+        for root, dirs, files in os.walk(local_path):
+            for file in files:
+                if file.endswith(('.py', '.txt', '.json', '.md')):
+                    local_file = os.path.join(root, file)
+                    s3_key = f"scraper-code/{os.path.relpath(local_file, local_path)}"
+                    uploads.append((local_file, s3_key))
+        
+        # Files are small, so uploads are dominated by round-trips; run them concurrently
+        # (boto3 clients are thread-safe)
+        with ThreadPoolExecutor(max_workers=S3_UPLOAD_CONCURRENCY, thread_name_prefix="S3Upload") as executor:
+            futures = {
+                executor.submit(self.s3_client.upload_file, local_file, CONFIG.aws.s3_bucket, s3_key): (local_file, s3_key)
+                for local_file, s3_key in uploads
+            }
             
-        except ClientError as e:
-            logger.error(f"Error uploading code to S3: {e}")
-            raise
+            errors = []
+            for future in as_completed(futures):
+                local_file, s3_key = futures[future]
+                try:
+                    future.result()
+                    logger.info(f"Uploaded {local_file} to s3://{CONFIG.aws.s3_bucket}/{s3_key}")
+                except ClientError as e:
+                    logger.error(f"Error uploading {local_file} to S3: {e}")
+                    errors.append(e)
+        
+        if errors:
+            raise errors[0]
+        
+        logger.info(f"Code upload to S3 completed ({len(uploads)} files)")
 
 
 class AutoScaler:
     """Automatic scaling based on queue size and performance metrics"""
     
-    def __init__(self, orchestrator: EC2Orchestrator):
+    def __init__(self, orchestrator: EC2Orchestrator, scale_out_periods: int = 1,
+                 scale_in_periods: int = 10):
         self.orchestrator = orchestrator
         self.is_running = False
         self.scaling_thread = None
@@ -472,15 +517,41 @@ class AutoScaler:
         # Scaling parameters
         self.scale_up_threshold = 500  # Scale up when queue has > 500 tasks
         self.scale_down_threshold = 50  # Scale down when queue has < 50 tasks
+        self.time_to_empty_slo = 30  # Scale up when the backlog needs > 30 minutes to drain
+        self.growth_rate_threshold = 50  # Scale up when the queue grows > 50 tasks/minute
         self.min_instances = CONFIG.aws.min_instances
         self.max_instances = CONFIG.aws.max_instances
         
+        # Decisions run on a fixed wall-clock period, independent of how often metrics are reported
+        self.evaluation_interval = 60
+        # Throughput and growth are measured over this many seconds of queue samples
+        self.trend_window = 300
+        # No further scale-out until new instances have booted and started pulling work
+        self.scale_out_cooldown = 600
+        self._last_scale_out = None
+        
+        # Consecutive evaluation periods a signal must hold before acting
+        self.scale_out_periods = scale_out_periods
+        self.scale_in_periods = scale_in_periods
+        self._scale_out_breaches = 0
+        self._scale_in_breaches = 0
+        
+        self.health_check_interval = 300
+        self._last_health_check = 0.0
+        
+        # Latest (pending_tasks, completed_tasks) from the orchestrator, and the
+        # (monotonic time, pending_tasks, completed_tasks) samples taken each evaluation
+        self._latest_metrics = None
+        self._samples = deque()
+        self._stop_event = threading.Event()
+        
         self.current_instances = []
     
     def start_auto_scaling(self):
         """Start automatic scaling monitoring"""
         
         self.is_running = True
+        self._stop_event.clear()
         self.scaling_thread = threading.Thread(target=self._scaling_loop, daemon=True)
         self.scaling_thread.start()
         
@@ -490,29 +561,84 @@ class AutoScaler:
         """Stop automatic scaling"""
         
         self.is_running = False
+        self._stop_event.set()
         if self.scaling_thread and self.scaling_thread.is_alive():
             self.scaling_thread.join(timeout=10)
         
         logger.info("Auto-scaling stopped")
     
+    def report_queue_metrics(self, pending_tasks: int, completed_tasks: int):
+        """Receive the latest queue counts; they are sampled at the next evaluation"""
+        
+        self._latest_metrics = (pending_tasks, completed_tasks)
+    
+    def _current_metrics(self):
+        """Return the latest reported counts, falling back to a queue snapshot"""
+        
+        metrics, self._latest_metrics = self._latest_metrics, None
+        if metrics is not None:
+            return metrics
+        
+        from distributed_queue import task_queue
+        stats = task_queue.get_stats()
+        return int(stats.get('pending_tasks', 0)), int(stats.get('completed_tasks', 0))
+    
+    def _queue_trend(self, pending_tasks: int, completed_tasks: int):
+        """
+        Record a sample and measure the queue over the trend window
+        
+        Returns:
+            (pending_growth_rate, time_to_empty) in tasks/minute and minutes, both 0.0
+            until the samples span a full trend window
+        """
+        now = time.monotonic()
+        self._samples.append((now, pending_tasks, completed_tasks))
+        while len(self._samples) > 1 and now - self._samples[1][0] >= self.trend_window:
+            self._samples.popleft()
+        
+        oldest_time, oldest_pending, oldest_completed = self._samples[0]
+        if now - oldest_time < self.trend_window:
+            return 0.0, 0.0
+        
+        window_minutes = (now - oldest_time) / 60.0
+        pending_growth_rate = (pending_tasks - oldest_pending) / window_minutes
+        tasks_per_minute = (completed_tasks - oldest_completed) / window_minutes
+        
+        # No throughput in the window means no estimate; the pending-size threshold still applies
+        time_to_empty = pending_tasks / tasks_per_minute if tasks_per_minute > 0 else 0.0
+        return pending_growth_rate, time_to_empty
+    
     def _scaling_loop(self):
         """Main scaling decision loop"""
         
         while self.is_running:
             try:
-                # Get current metrics
-                from distributed_queue import task_queue
-                stats = task_queue.get_stats()
-                
-                pending_tasks = int(stats.get('pending_tasks', 0))
-                active_workers = int(stats.get('active_workers', 0))
+                if self._stop_event.wait(timeout=self.evaluation_interval):
+                    break
                 
+                pending_tasks, completed_tasks = self._current_metrics()
+                growth_rate, time_to_empty = self._queue_trend(pending_tasks, completed_tasks)
                 current_instance_count = len(self.current_instances)
                 
-                logger.info(f"Scaling check: {pending_tasks} pending tasks, {active_workers} workers, {current_instance_count} instances")
+                logger.info(f"Scaling check: {pending_tasks} pending tasks, "
+                            f"{growth_rate:+.1f} tasks/min growth, "
+                            f"{time_to_empty:.1f} min to empty, {current_instance_count} instances")
+                
+                # Track how many consecutive periods each signal has held
+                scale_out_signal = (pending_tasks > self.scale_up_threshold or
+                                    time_to_empty > self.time_to_empty_slo or
+                                    growth_rate > self.growth_rate_threshold)
+                scale_in_signal = pending_tasks < self.scale_down_threshold and growth_rate <= 0
+                
+                self._scale_out_breaches = self._scale_out_breaches + 1 if scale_out_signal else 0
+                self._scale_in_breaches = self._scale_in_breaches + 1 if scale_in_signal else 0
+                
+                cooling_down = (self._last_scale_out is not None and
+                                time.monotonic() - self._last_scale_out < self.scale_out_cooldown)
                 
                 # Scaling decision logic
-                if pending_tasks > self.scale_up_threshold and current_instance_count < self.max_instances:
+                if (self._scale_out_breaches >= self.scale_out_periods and not cooling_down and
+                        current_instance_count < self.max_instances):
                     # Scale up
                     instances_to_add = min(
                         (pending_tasks // 200) + 1,  # 1 instance per 200 tasks
@@ -522,8 +648,11 @@ class AutoScaler:
                     logger.info(f"Scaling up: adding {instances_to_add} instances")
                     new_instances = self.orchestrator.create_scraper_instances(instances_to_add)
                     self.current_instances.extend(new_instances)
+                    self._last_scale_out = time.monotonic()
+                    self._scale_out_breaches = 0
                 
-                elif pending_tasks < self.scale_down_threshold and current_instance_count > self.min_instances:
+                elif (self._scale_in_breaches >= self.scale_in_periods and
+                        current_instance_count > self.min_instances):
                     # Scale down
                     instances_to_remove = min(
                         current_instance_count - self.min_instances,
@@ -539,9 +668,12 @@ class AutoScaler:
                         
                         # Update instance list
                         self.current_instances = self.current_instances[instances_to_remove:]
+                    self._scale_in_breaches = 0
                 
                 # Health check - remove unhealthy instances
-                if self.current_instances:
+                now = time.monotonic()
+                if self.current_instances and now - self._last_health_check >= self.health_check_interval:
+                    self._last_health_check = now
                     health_status = self.orchestrator.get_instance_health(self.current_instances)
                     
                     unhealthy_instances = [
@@ -558,11 +690,9 @@ class AutoScaler:
                             if instance_id in self.current_instances:
                                 self.current_instances.remove(instance_id)
                 
-                time.sleep(300)  # Check every 5 minutes
-                
             except Exception as e:
                 logger.error(f"Auto-scaling error: {e}")
-                time.sleep(60)  # Shorter sleep on error
+                time.sleep(60)  # Back off before the next evaluation
 
 
 def main():
@@ -5,38 +5,70 @@ Coordinates the entire distributed scraping operation
 """
 
 import argparse
+import asyncio
 import logging
+import logging.handlers
+import queue
+import random
 import sys
 import time
 import signal
 import threading
-from datetime import datetime
+from datetime import timedelta
 from typing import List, Dict
 
 from config import CONFIG
 from distributed_queue import task_queue
-from distributed_scraper import DistributedScrapingWorker
+from distributed_scraper import DistributedScrapingWorker, run_async_workers, ASYNC_FETCH_AVAILABLE
 from data_storage import data_storage
 from monitoring import start_monitoring_services, stop_monitoring_services, performance_collector
 from ec2_orchestrator import EC2Orchestrator, AutoScaler
 
 logger = logging.getLogger(__name__)
 
+# How long shutdown waits for the final JSON export before moving on
+EXPORT_TIMEOUT = 600  # 10 minutes
+
+# How long shutdown waits, in total, for local workers to finish their current tasks
+WORKER_SHUTDOWN_TIMEOUT = 30
+
+# Maximum age, in seconds, of monitor statistics reused for the final summary
+STATS_REUSE_MAX_AGE = 10
+
+# Rule printed around progress and final statistics reports
+REPORT_SEPARATOR = "=" * 80
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Progress report interval, shortened while the run is idling on its last few tasks
+MONITOR_INTERVAL = 60
+IDLE_MONITOR_INTERVAL = 5
+IDLE_PENDING_THRESHOLD = 100
+
 
 class ScrapingOrchestrator:
     """Main orchestrator for the distributed scraping system"""
     
     def __init__(self):
         self.workers = []
-        self.is_running = False
+        self._running = threading.Event()  # Set while monitoring, cleared on shutdown
         self.ec2_orchestrator = None
         self.auto_scaler = None
         self.start_time = None
         
+        # Most recent statistics fetched by the monitor loop, reused at shutdown
+        self._last_queue_stats = None
+        self._last_db_stats = None
+        self._last_stats_time = 0.0
+        
         # Signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
     
+    @property
+    def is_running(self) -> bool:
+        """Whether progress monitoring is active and shutdown has not begun"""
+        return self._running.is_set()
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         logger.info(f"Received signal {signum}, initiating graceful shutdown...")
@@ -72,10 +104,19 @@ class ScrapingOrchestrator:
             logger.error(f"Error setting up infrastructure: {e}")
             raise
     
-    def start_local_workers(self, worker_count: int = None):
+    def start_local_workers(self, worker_count: int = None, use_async: bool = None):
         """Start local worker processes"""
         
         worker_count = worker_count or CONFIG.scraping.max_workers
+        use_async = CONFIG.scraping.async_workers if use_async is None else use_async
+        
+        if use_async and not ASYNC_FETCH_AVAILABLE:
+            logger.warning("aiohttp/lxml not installed, falling back to threaded workers")
+            use_async = False
+        
+        if use_async:
+            self._start_async_workers(worker_count)
+            return
         
         logger.info(f"Starting {worker_count} local workers...")
         
@@ -99,9 +140,6 @@ class ScrapingOrchestrator:
                 })
                 
                 logger.info(f"Started worker: {worker_id}")
-                
-                # Small delay between worker starts
-                time.sleep(2)
             
             logger.info(f"All {worker_count} local workers started successfully")
             
@@ -109,6 +147,35 @@ class ScrapingOrchestrator:
             logger.error(f"Error starting local workers: {e}")
             raise
     
+    def _start_async_workers(self, worker_count: int):
+        """Run all local workers as coroutines on a single event loop thread"""
+        
+        logger.info(f"Starting {worker_count} local async workers...")
+        
+        try:
+            workers = [DistributedScrapingWorker(f"local-worker-{i+1}") for i in range(worker_count)]
+            
+            loop_thread = threading.Thread(
+                target=asyncio.run,
+                args=(run_async_workers(workers),),
+                name="Worker-event-loop",
+                daemon=True
+            )
+            loop_thread.start()
+            
+            for worker in workers:
+                self.workers.append({
+                    'worker': worker,
+                    'thread': loop_thread,
+                    'worker_id': worker.worker_id
+                })
+            
+            logger.info(f"All {worker_count} local async workers started successfully")
+            
+        except Exception as e:
+            logger.error(f"Error starting local async workers: {e}")
+            raise
+    
     def deploy_cloud_workers(self, instance_count: int = 5):
         """Deploy workers to EC2 instances"""
         
@@ -140,26 +207,38 @@ class ScrapingOrchestrator:
         
         logger.info("Starting progress monitoring...")
         
-        self.is_running = True
-        self.start_time = datetime.now()
+        self._running.set()
+        self.start_time = time.monotonic()
+        
+        # Completion events let us react as soon as the run may be finished
+        progress = task_queue.subscribe_progress()
+        
+        # Completed count at the previous report, used to detect an idling queue
+        prev_completed = 0
+        
+        target_questions = CONFIG.target_total_questions
         
         try:
             while self.is_running:
                 # Get current statistics
                 queue_stats = task_queue.get_stats()
                 db_stats = data_storage.get_scraping_statistics()
+                self._last_queue_stats = queue_stats
+                self._last_db_stats = db_stats
+                self._last_stats_time = time.monotonic()
+                qget = queue_stats.get
+                dget = db_stats.get
                 
                 # Calculate progress
-                total_tasks = int(queue_stats.get('total_tasks', 0))
-                completed_tasks = int(queue_stats.get('completed_tasks', 0))
-                pending_tasks = int(queue_stats.get('pending_tasks', 0))
-                failed_tasks = int(queue_stats.get('failed_tasks', 0))
+                total_tasks = int(qget('total_tasks', 0))
+                completed_tasks = int(qget('completed_tasks', 0))
+                pending_tasks = int(qget('pending_tasks', 0))
+                failed_tasks = int(qget('failed_tasks', 0))
                 
                 progress_percent = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
                 
                 # Calculate runtime and ETA
-                runtime = datetime.now() - self.start_time
-                runtime_minutes = runtime.total_seconds() / 60
+                runtime_minutes = (time.monotonic() - self.start_time) / 60.0
                 
                 # Calculate rates
                 if runtime_minutes > 0:
@@ -169,50 +248,51 @@ class ScrapingOrchestrator:
                     tasks_per_minute = 0
                     eta_minutes = 0
                 
-                # Print progress report
-                logger.info("=" * 80)
-                logger.info(f"SCRAPING PROGRESS REPORT - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                logger.info("=" * 80)
-                logger.info(f"📊 Overall Progress: {completed_tasks}/{total_tasks} tasks ({progress_percent:.1f}%)")
-                logger.info(f"⏳ Pending Tasks: {pending_tasks}")
-                logger.info(f"❌ Failed Tasks: {failed_tasks}")
-                logger.info(f"🕐 Runtime: {runtime_minutes:.1f} minutes")
-                logger.info(f"⚡ Rate: {tasks_per_minute:.1f} tasks/minute")
-                
-                if eta_minutes > 0:
-                    eta_hours = eta_minutes / 60
-                    if eta_hours > 24:
-                        logger.info(f"⏰ ETA: {eta_hours/24:.1f} days")
-                    elif eta_hours > 1:
-                        logger.info(f"⏰ ETA: {eta_hours:.1f} hours")
-                    else:
-                        logger.info(f"⏰ ETA: {eta_minutes:.1f} minutes")
+                if self.auto_scaler:
+                    self.auto_scaler.report_queue_metrics(pending_tasks, completed_tasks)
                 
                 # Database statistics
-                total_questions = db_stats.get('total_questions', 0)
-                unique_questions = db_stats.get('unique_questions', 0)
-                
-                logger.info(f"🗄️  Database: {total_questions} total, {unique_questions} unique questions")
-                
-                if runtime_minutes > 0:
-                    questions_per_minute = total_questions / runtime_minutes
-                    logger.info(f"📈 Question Rate: {questions_per_minute:.1f} questions/minute")
-                
-                # Worker statistics
-                active_workers = int(queue_stats.get('active_workers', 0))
-                logger.info(f"👥 Active Workers: {active_workers}")
+                total_questions = dget('total_questions', 0)
+                unique_questions = dget('unique_questions', 0)
                 
-                # Top tags
-                top_tags = db_stats.get('top_tags', {})
-                if top_tags:
-                    top_5_tags = list(top_tags.items())[:5]
-                    tags_str = ', '.join([f"{tag}({count})" for tag, count in top_5_tags])
-                    logger.info(f"🏷️  Top Tags: {tags_str}")
-                
-                logger.info("=" * 80)
+                # Print progress report (skipped entirely when INFO is disabled)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(REPORT_SEPARATOR)
+                    logger.info("SCRAPING PROGRESS REPORT - %s", time.strftime(TIMESTAMP_FORMAT))
+                    logger.info(REPORT_SEPARATOR)
+                    logger.info("📊 Overall Progress: %d/%d tasks (%.1f%%)", completed_tasks, total_tasks, progress_percent)
+                    logger.info("⏳ Pending Tasks: %d", pending_tasks)
+                    logger.info("❌ Failed Tasks: %d", failed_tasks)
+                    logger.info("🕐 Runtime: %.1f minutes", runtime_minutes)
+                    logger.info("⚡ Rate: %.1f tasks/minute", tasks_per_minute)
+                    
+                    if eta_minutes > 0:
+                        eta_hours = eta_minutes / 60
+                        if eta_hours > 24:
+                            logger.info("⏰ ETA: %.1f days", eta_hours / 24)
+                        elif eta_hours > 1:
+                            logger.info("⏰ ETA: %.1f hours", eta_hours)
+                        else:
+                            logger.info("⏰ ETA: %.1f minutes", eta_minutes)
+                    
+                    logger.info("🗄️  Database: %d total, %d unique questions", total_questions, unique_questions)
+                    
+                    if runtime_minutes > 0:
+                        logger.info("📈 Question Rate: %.1f questions/minute", total_questions / runtime_minutes)
+                    
+                    # Worker statistics
+                    logger.info("👥 Active Workers: %d", int(qget('active_workers', 0)))
+                    
+                    # Top tags
+                    top_tags = dget('top_tags', {})
+                    if top_tags:
+                        top_5_tags = list(top_tags.items())[:5]
+                        logger.info("🏷️  Top Tags: %s", ', '.join([f"{tag}({count})" for tag, count in top_5_tags]))
+                    
+                    logger.info(REPORT_SEPARATOR)
                 
                 # Check if we've reached our target
-                if unique_questions >= CONFIG.target_total_questions:
+                if unique_questions >= target_questions:
                     logger.info(f"🎉 TARGET REACHED! Scraped {unique_questions} unique questions")
                     self.shutdown()
                     break
@@ -223,33 +303,74 @@ class ScrapingOrchestrator:
                     self.shutdown()
                     break
                 
-                # Sleep before next check
-                time.sleep(60)  # Report every minute
+                # Poll quickly when nothing finished since the last report and the queue is
+                # nearly drained; jitter keeps a fleet of monitors from reporting in lockstep
+                if completed_tasks == prev_completed and pending_tasks < IDLE_PENDING_THRESHOLD:
+                    interval = IDLE_MONITOR_INTERVAL
+                else:
+                    interval = MONITOR_INTERVAL
+                prev_completed = completed_tasks
+                
+                # Wait for the next report, or earlier if completions may have finished the run
+                outstanding_tasks = pending_tasks + int(qget('processing_tasks', 0))
+                self._wait_for_progress(progress, interval * random.uniform(0.9, 1.1), outstanding_tasks,
+                                        target_questions - unique_questions)
                 
         except KeyboardInterrupt:
             logger.info("Progress monitoring interrupted by user")
         except Exception as e:
             logger.error(f"Error in progress monitoring: {e}")
+        finally:
+            progress.close()
+    
+    def _wait_for_progress(self, progress, timeout: float, outstanding_tasks: int, questions_needed: int):
+        """Block on completion events until the next report is due
+        
+        Returns early once enough tasks have completed to drain the queue or
+        enough questions have been scraped to reach the target.
+        """
+        deadline = time.time() + timeout
+        tasks_completed = 0
+        questions_scraped = 0
+        
+        while self.is_running:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            
+            message = progress.get_message(timeout=remaining)
+            if not message:
+                continue
+            
+            tasks_completed += 1
+            questions_scraped += int(message['data'])
+            
+            if tasks_completed >= outstanding_tasks or questions_scraped >= questions_needed:
+                return
     
     def shutdown(self):
         """Gracefully shutdown the entire operation"""
         
         logger.info("Initiating graceful shutdown of scraping operation...")
         
-        self.is_running = False
+        self._running.clear()
         
         try:
             # Stop local workers
             for worker_info in self.workers:
-                worker_info['worker'].is_running = False
+                worker_info['worker'].stop()
             
             logger.info("Stopping local workers...")
             
-            # Wait for workers to finish current tasks (with timeout)
+            # Wait for workers to finish current tasks, bounded by one shared deadline
+            deadline = time.monotonic() + WORKER_SHUTDOWN_TIMEOUT
             for worker_info in self.workers:
-                worker_info['thread'].join(timeout=30)
-                if worker_info['thread'].is_alive():
-                    logger.warning(f"Worker {worker_info['worker_id']} did not shutdown gracefully")
+                worker_info['thread'].join(timeout=max(0.0, deadline - time.monotonic()))
+            
+            stragglers = [worker_info['worker_id'] for worker_info in self.workers
+                          if worker_info['thread'].is_alive()]
+            if stragglers:
+                logger.warning(f"Workers did not shutdown gracefully: {', '.join(stragglers)}")
             
             # Stop auto-scaling
             if self.auto_scaler:
@@ -271,14 +392,30 @@ class ScrapingOrchestrator:
         """Print final statistics summary"""
         
         try:
-            queue_stats = task_queue.get_stats()
-            db_stats = data_storage.get_scraping_statistics()
+            # Export final data in the background while the summary is gathered and logged; a
+            # daemon thread so an export still running at EXPORT_TIMEOUT does not hold up exit
+            export_result = []
+            export_thread = threading.Thread(
+                target=lambda: export_result.append(data_storage.export_questions_json()),
+                name="Export", daemon=True
+            )
+            export_thread.start()
+            logger.info("Final data export queued")
+            
+            # Reuse the monitor loop's statistics unless they have gone stale
+            if (self._last_queue_stats is not None and
+                    time.monotonic() - self._last_stats_time < STATS_REUSE_MAX_AGE):
+                queue_stats = self._last_queue_stats
+                db_stats = self._last_db_stats
+            else:
+                queue_stats = task_queue.get_stats()
+                db_stats = data_storage.get_scraping_statistics()
             
-            runtime = datetime.now() - self.start_time if self.start_time else None
+            runtime = timedelta(seconds=int(time.monotonic() - self.start_time)) if self.start_time else None
             
-            logger.info("\n" + "=" * 80)
+            logger.info("\n" + REPORT_SEPARATOR)
             logger.info("FINAL SCRAPING STATISTICS")
-            logger.info("=" * 80)
+            logger.info(REPORT_SEPARATOR)
             
             if runtime:
                 logger.info(f"Total Runtime: {runtime}")
@@ -288,17 +425,39 @@ class ScrapingOrchestrator:
             logger.info(f"Total Questions Scraped: {db_stats.get('total_questions', 0)}")
             logger.info(f"Unique Questions: {db_stats.get('unique_questions', 0)}")
             
-            # Export final data
-            filename = data_storage.export_questions_json()
-            if filename:
-                logger.info(f"Final data exported to: {filename}")
+            export_thread.join(timeout=EXPORT_TIMEOUT)
+            if export_thread.is_alive():
+                logger.warning(f"Final data export still running after {EXPORT_TIMEOUT}s, continuing shutdown")
+            elif export_result and export_result[0]:
+                logger.info(f"Final data exported to: {export_result[0]}")
             
-            logger.info("=" * 80)
+            logger.info(REPORT_SEPARATOR)
             
         except Exception as e:
             logger.error(f"Error printing final stats: {e}")
 
 
+def configure_logging(level: int) -> logging.handlers.QueueListener:
+    """Route log records through a queue so callers never block on stdout or file I/O"""
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler('/var/log/stackoverflow-scraper.log' if sys.platform.startswith('linux') else 'scraper.log')
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
 def main():
     """Main entry point"""
     
@@ -315,18 +474,13 @@ def main():
                        default='INFO', help='Logging level (default: INFO)')
     parser.add_argument('--setup-only', action='store_true',
                        help='Only set up infrastructure without starting scraping')
+    parser.add_argument('--threaded', action='store_true',
+                       help='Drive Chrome from worker threads instead of the asyncio HTTP workers')
     
     args = parser.parse_args()
     
     # Configure logging
-    logging.basicConfig(
-        level=getattr(logging, args.log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('/var/log/stackoverflow-scraper.log' if sys.platform.startswith('linux') else 'scraper.log')
-        ]
-    )
+    log_listener = configure_logging(getattr(logging, args.log_level))
     
     # Update target in config
     CONFIG.target_total_questions = args.target
@@ -346,7 +500,7 @@ def main():
         
         # Start workers based on mode
         if args.mode in ['local', 'hybrid']:
-            orchestrator.start_local_workers(args.workers)
+            orchestrator.start_local_workers(args.workers, use_async=False if args.threaded else None)
         
         if args.mode in ['cloud', 'hybrid']:
             orchestrator.deploy_cloud_workers(args.instances)
@@ -361,6 +515,8 @@ def main():
         raise
     finally:
         orchestrator.shutdown()
+        # Flush queued records once nothing else will log
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -3,18 +3,36 @@ Health Check and Monitoring System for Distributed Stack Overflow Scraper
 Provides health endpoints, metrics collection, and system monitoring
 """
 
+import hashlib
+import hmac
 import time
 import threading
 import psutil
 import logging
+import orjson
+from collections import Counter as TallyCounter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from prometheus_client import Counter, Histogram, Gauge, generate_latest
 from config import CONFIG
 from distributed_queue import task_queue
 from data_storage import data_storage
 
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+try:
+    from prometheus_flask_exporter import PrometheusMetrics
+    PROMETHEUS_FLASK_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_FLASK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Prometheus metrics
@@ -26,6 +44,109 @@ SYSTEM_CPU = Gauge('system_cpu_percent', 'System CPU usage percentage')
 SYSTEM_MEMORY = Gauge('system_memory_percent', 'System memory usage percentage')
 DATABASE_CONNECTIONS = Gauge('database_connections', 'Number of database connections')
 
+# Seconds a rendered /metrics body is served before the registry is serialized again
+METRICS_CACHE_TTL = 5.0
+
+# Dependency checks behind /health run concurrently, each bounded by a timeout
+HEALTH_CHECK_TIMEOUT = 2.0
+_health_check_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="HealthCheck")
+
+
+class _CachedPsutil:
+    """psutil readings cached for a short TTL so bursts of callers share one kernel read"""
+    
+    CPU_TTL = 5.0
+    MEMORY_TTL = 5.0
+    DISK_TTL = 30.0
+    NETWORK_TTL = 5.0
+    
+    def __init__(self):
+        self._cache = {}  # name -> (value, expiry)
+        self._lock = threading.Lock()
+        
+        # Prime the CPU counter so later non-blocking reads have a baseline
+        psutil.cpu_percent(interval=None)
+    
+    def _get(self, name: str, ttl: float, loader):
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached and cached[1] > now:
+                return cached[0]
+            
+            value = loader()
+            self._cache[name] = (value, now + ttl)
+            return value
+    
+    def cpu_percent(self) -> float:
+        return self._get('cpu_percent', self.CPU_TTL, lambda: psutil.cpu_percent(interval=None))
+    
+    def virtual_memory(self):
+        return self._get('virtual_memory', self.MEMORY_TTL, psutil.virtual_memory)
+    
+    def disk_usage(self):
+        return self._get('disk_usage', self.DISK_TTL, lambda: psutil.disk_usage('/'))
+    
+    def net_io_counters(self):
+        return self._get('net_io_counters', self.NETWORK_TTL, psutil.net_io_counters)
+
+
+cached_psutil = _CachedPsutil()
+
+
+@dataclass
+class _SystemSnapshot:
+    """System and process resource usage read once and shared by a request"""
+    cpu_percent: float
+    memory_percent: float
+    disk_usage_percent: float
+    network_io: Dict = field(default_factory=dict)
+    process_memory_rss: int = 0
+    process_threads: int = 0
+    
+    @classmethod
+    def collect(cls) -> '_SystemSnapshot':
+        """Read the (TTL-cached) system-wide counters, then the process counters in a single oneshot()"""
+        process = psutil.Process()
+        with process.oneshot():
+            process_memory_rss = process.memory_info().rss
+            process_threads = process.num_threads()
+        
+        return cls(
+            cpu_percent=cached_psutil.cpu_percent(),
+            memory_percent=cached_psutil.virtual_memory().percent,
+            disk_usage_percent=cached_psutil.disk_usage().percent,
+            network_io=cached_psutil.net_io_counters()._asdict(),
+            process_memory_rss=process_memory_rss,
+            process_threads=process_threads
+        )
+
+
+# Response bodies that never change, serialized once at import
+_UNAUTHORIZED_BODY = orjson.dumps({'error': 'Unauthorized'})
+_SHUTTING_DOWN_BODY = orjson.dumps({'status': 'shutting_down'})
+_HEALTHY_BODY_TEMPLATE = (
+    '{"status":"healthy","timestamp":"%s","uptime_seconds":%r,'
+    '"checks":{"database":"healthy","redis":"healthy","application":"healthy"}}'
+)
+
+
+def _static_json(body: bytes, status: int = 200) -> Response:
+    """Wrap a pre-serialized JSON body in a fresh response"""
+    return Response(body, status=status, mimetype='application/json')
+
+
+def fast_json(obj, status: int = 200) -> Response:
+    """JSON response serialized with orjson instead of the stdlib encoder behind jsonify"""
+    return Response(orjson.dumps(obj, default=str), status=status, mimetype='application/json')
+
+
+def _do_not_track(view):
+    """Exclude a view from the exporter's HTTP request metrics"""
+    if PROMETHEUS_FLASK_AVAILABLE:
+        return PrometheusMetrics.do_not_track()(view)
+    return view
+
 
 class HealthCheckServer:
     """Health check and monitoring web server"""
@@ -33,30 +154,57 @@ class HealthCheckServer:
     def __init__(self, port: int = None):
         self.port = port or CONFIG.monitoring.health_check_port
         self.app = Flask(__name__)
+        
+        # The exporter adds per-endpoint HTTP request metrics; /metrics itself is served below
+        self.metrics = PrometheusMetrics(self.app, path=None) if PROMETHEUS_FLASK_AVAILABLE else None
+        
+        # Rendered /metrics body, reused across scrapes until it expires
+        self._metrics_body = None
+        self._metrics_etag = None
+        self._metrics_expiry = 0.0
+        self._metrics_lock = threading.Lock()
+        
         self.setup_routes()
         self.is_healthy = True
         self.start_time = datetime.now()
+        self.start_monotonic = time.monotonic()  # Uptime source, immune to wall-clock jumps
+        
+        # Shutdown credentials compared in constant time; the shutdown thread is started at most once
+        self._expected_auth = f"Bearer {CONFIG.shutdown_key}".encode()
+        self._shutdown_thread = threading.Thread(target=self._graceful_shutdown, name="GracefulShutdown", daemon=True)
+        self._shutdown_lock = threading.Lock()
+        
+        # Labelled gauge children resolved once instead of on every scrape
+        self._q_pending = QUEUE_SIZE.labels(queue_type='pending')
+        self._q_processing = QUEUE_SIZE.labels(queue_type='processing')
         
     def setup_routes(self):
         """Setup Flask routes for health checking"""
         
         @self.app.route('/health')
+        @_do_not_track  # Liveness probes would swamp the latency histograms
         def health_check():
             """Basic health check endpoint"""
             try:
-                # Check database connectivity
-                db_healthy = self._check_database_health()
+                # Check database and Redis connectivity in parallel
+                db_future = _health_check_executor.submit(self._check_database_health)
+                redis_future = _health_check_executor.submit(self._check_redis_health)
                 
-                # Check Redis connectivity
-                redis_healthy = self._check_redis_health()
+                db_healthy = self._check_result(db_future, 'Database')
+                redis_healthy = self._check_result(redis_future, 'Redis')
                 
                 # Overall health
                 overall_healthy = db_healthy and redis_healthy and self.is_healthy
                 
+                if overall_healthy:
+                    # Common case: only the timestamp and uptime vary
+                    body = _HEALTHY_BODY_TEMPLATE % (datetime.now().isoformat(), time.monotonic() - self.start_monotonic)
+                    return _static_json(body.encode())
+                
                 status = {
-                    'status': 'healthy' if overall_healthy else 'unhealthy',
+                    'status': 'unhealthy',
                     'timestamp': datetime.now().isoformat(),
-                    'uptime_seconds': (datetime.now() - self.start_time).total_seconds(),
+                    'uptime_seconds': time.monotonic() - self.start_monotonic,
                     'checks': {
                         'database': 'healthy' if db_healthy else 'unhealthy',
                         'redis': 'healthy' if redis_healthy else 'unhealthy',
@@ -64,7 +212,7 @@ class HealthCheckServer:
                     }
                 }
                 
-                return jsonify(status), 200 if overall_healthy else 503
+                return jsonify(status), 503
                 
             except Exception as e:
                 logger.error(f"Health check error: {e}")
@@ -78,11 +226,15 @@ class HealthCheckServer:
         def metrics():
             """Prometheus metrics endpoint"""
             try:
-                # Update system metrics
-                self._update_system_metrics()
+                body, etag = self._render_metrics()
                 
-                # Generate Prometheus format
-                return generate_latest(), 200, {'Content-Type': 'text/plain'}
+                # Scrapers that send back the ETag skip the transfer while the metric values are unchanged
+                if request.if_none_match.contains(etag):
+                    response = Response(status=304)
+                else:
+                    response = Response(body, mimetype='text/plain')
+                response.set_etag(etag)
+                return response
                 
             except Exception as e:
                 logger.error(f"Metrics error: {e}")
@@ -93,7 +245,7 @@ class HealthCheckServer:
             """Detailed statistics endpoint"""
             try:
                 stats = self._get_comprehensive_stats()
-                return jsonify(stats), 200
+                return fast_json(stats)
                 
             except Exception as e:
                 logger.error(f"Stats error: {e}")
@@ -104,7 +256,7 @@ class HealthCheckServer:
             """Active workers information"""
             try:
                 worker_info = task_queue.get_stats()
-                return jsonify(worker_info), 200
+                return fast_json(worker_info)
                 
             except Exception as e:
                 logger.error(f"Workers error: {e}")
@@ -114,22 +266,32 @@ class HealthCheckServer:
         def shutdown():
             """Graceful shutdown endpoint"""
             try:
-                auth_key = request.headers.get('Authorization')
-                if auth_key != f"Bearer {CONFIG.shutdown_key}":
-                    return jsonify({'error': 'Unauthorized'}), 401
+                auth_key = request.headers.get('Authorization', '').encode()
+                if not hmac.compare_digest(auth_key, self._expected_auth):
+                    return _static_json(_UNAUTHORIZED_BODY, 401)
                 
                 logger.info("Received shutdown request")
                 self.is_healthy = False
                 
-                # Trigger graceful shutdown
-                threading.Thread(target=self._graceful_shutdown, daemon=True).start()
+                # Trigger graceful shutdown (repeat requests find it already running)
+                with self._shutdown_lock:
+                    if self._shutdown_thread.ident is None:
+                        self._shutdown_thread.start()
                 
-                return jsonify({'status': 'shutting_down'}), 200
+                return _static_json(_SHUTTING_DOWN_BODY)
                 
             except Exception as e:
                 logger.error(f"Shutdown error: {e}")
                 return jsonify({'error': str(e)}), 500
     
+    def _check_result(self, future, name: str) -> bool:
+        """Wait for a submitted health check, treating a timeout as unhealthy"""
+        try:
+            return future.result(timeout=HEALTH_CHECK_TIMEOUT)
+        except TimeoutError:
+            logger.error(f"{name} health check timed out after {HEALTH_CHECK_TIMEOUT}s")
+            return False
+    
     def _check_database_health(self) -> bool:
         """Check database connectivity"""
         try:
@@ -148,17 +310,30 @@ class HealthCheckServer:
             logger.error(f"Redis health check failed: {e}")
             return False
     
-    def _update_system_metrics(self):
+    def _render_metrics(self):
+        """Return the Prometheus exposition body and its content hash, regenerating once per TTL"""
+        with self._metrics_lock:
+            now = time.monotonic()
+            if self._metrics_body is None or now >= self._metrics_expiry:
+                self._update_system_metrics()
+                self._metrics_body = generate_latest()
+                self._metrics_etag = hashlib.blake2b(self._metrics_body, digest_size=16).hexdigest()
+                self._metrics_expiry = now + METRICS_CACHE_TTL
+            
+            return self._metrics_body, self._metrics_etag
+    
+    def _update_system_metrics(self, snapshot: _SystemSnapshot = None):
         """Update system-level Prometheus metrics"""
         try:
             # System metrics
-            SYSTEM_CPU.set(psutil.cpu_percent())
-            SYSTEM_MEMORY.set(psutil.virtual_memory().percent)
+            snapshot = snapshot or _SystemSnapshot.collect()
+            SYSTEM_CPU.set(snapshot.cpu_percent)
+            SYSTEM_MEMORY.set(snapshot.memory_percent)
             
             # Queue metrics
             stats = task_queue.get_stats()
-            QUEUE_SIZE.labels(queue_type='pending').set(stats.get('pending_tasks', 0))
-            QUEUE_SIZE.labels(queue_type='processing').set(stats.get('processing_tasks', 0))
+            self._q_pending.set(stats.get('pending_tasks', 0))
+            self._q_processing.set(stats.get('processing_tasks', 0))
             ACTIVE_WORKERS.set(stats.get('active_workers', 0))
             
         except Exception as e:
@@ -174,12 +349,15 @@ class HealthCheckServer:
             db_stats = data_storage.get_scraping_statistics()
             
             # System stats
+            snapshot = _SystemSnapshot.collect()
             system_stats = {
-                'cpu_percent': psutil.cpu_percent(),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_usage': psutil.disk_usage('/').percent,
-                'network_io': dict(psutil.net_io_counters()._asdict()),
-                'uptime_seconds': (datetime.now() - self.start_time).total_seconds()
+                'cpu_percent': snapshot.cpu_percent,
+                'memory_percent': snapshot.memory_percent,
+                'disk_usage': snapshot.disk_usage_percent,
+                'network_io': snapshot.network_io,
+                'process_memory_rss': snapshot.process_memory_rss,
+                'process_threads': snapshot.process_threads,
+                'uptime_seconds': time.monotonic() - self.start_monotonic
             }
             
             return {
@@ -187,6 +365,7 @@ class HealthCheckServer:
                 'queue': queue_stats,
                 'database': db_stats,
                 'system': system_stats,
+                'performance': performance_collector.get_totals(),
                 'instance_id': CONFIG.aws.instance_id,
                 'worker_id': CONFIG.worker_id
             }
@@ -213,7 +392,13 @@ class HealthCheckServer:
     def run(self):
         """Start the health check server"""
         logger.info(f"Starting health check server on port {self.port}")
-        self.app.run(host='0.0.0.0', port=self.port, debug=False)
+        
+        if WAITRESS_AVAILABLE:
+            # Multi-threaded WSGI server so slow /stats calls don't queue up scrapes and probes
+            serve(self.app, host='0.0.0.0', port=self.port, threads=8)
+        else:
+            logger.warning("waitress not installed, falling back to the Flask development server")
+            self.app.run(host='0.0.0.0', port=self.port, debug=False, threaded=True)
 
 
 class SystemMonitor:
@@ -230,9 +415,22 @@ class SystemMonitor:
             'error_rate': 10.0
         }
         
+        # Seconds between runs of each check; cheap resource checks run most often
+        self.check_intervals = {
+            'system': 30,
+            'queue': 60,
+            'database': 300
+        }
+        self._wake_event = threading.Event()
+        
+        # Prime cpu_times_percent so the first check averages over the interval; nothing else here
+        # calls it, so unlike cpu_percent its window is not reset by the /health endpoint
+        psutil.cpu_times_percent(interval=None)
+        
     def start_monitoring(self):
         """Start background monitoring"""
         self.is_running = True
+        self._wake_event.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitor_thread.start()
         logger.info("System monitoring started")
@@ -240,30 +438,41 @@ class SystemMonitor:
     def stop_monitoring(self):
         """Stop background monitoring"""
         self.is_running = False
+        self._wake_event.set()
         if self.monitor_thread and self.monitor_thread.is_alive():
             self.monitor_thread.join(timeout=5)
         logger.info("System monitoring stopped")
     
     def _monitor_loop(self):
         """Main monitoring loop"""
+        checks = {
+            'system': self._check_system_health,
+            'queue': self._check_queue_health,
+            'database': self._check_database_health
+        }
+        next_run_at = dict.fromkeys(checks, time.monotonic())
+        
         while self.is_running:
             try:
-                self._check_system_health()
-                self._check_queue_health()
-                self._check_database_health()
+                now = time.monotonic()
+                for name, check in checks.items():
+                    if now >= next_run_at[name]:
+                        check()
+                        next_run_at[name] = now + self.check_intervals[name]
                 
-                time.sleep(60)  # Check every minute
+                # Sleep until the next check is due
+                self._wake_event.wait(max(0.0, min(next_run_at.values()) - time.monotonic()))
                 
             except Exception as e:
                 logger.error(f"Monitoring error: {e}")
-                time.sleep(30)  # Shorter sleep on error
+                self._wake_event.wait(30)  # Back off on error
     
     def _check_system_health(self):
         """Check system resource health"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory_percent = psutil.virtual_memory().percent
-            disk_percent = psutil.disk_usage('/').percent
+            cpu_percent = self._sample_cpu_percent()
+            memory_percent = cached_psutil.virtual_memory().percent
+            disk_percent = cached_psutil.disk_usage().percent
             
             if cpu_percent > self.alert_thresholds['cpu_percent']:
                 self._send_alert(f"High CPU usage: {cpu_percent}%")
@@ -277,6 +486,12 @@ class SystemMonitor:
         except Exception as e:
             logger.error(f"System health check error: {e}")
     
+    def _sample_cpu_percent(self) -> float:
+        """CPU usage since the previous monitor iteration, without blocking"""
+        times = psutil.cpu_times_percent(interval=None)
+        # Busy time as psutil.cpu_percent counts it: everything but idle and iowait
+        return round(100.0 - times.idle - getattr(times, 'iowait', 0), 1)
+    
     def _check_queue_health(self):
         """Check task queue health"""
         try:
@@ -317,59 +532,98 @@ class PerformanceCollector:
     def __init__(self):
         self.metrics = {
             'questions_per_minute': [],
-            'response_times': [],
-            'error_counts': {},
-            'worker_performance': {}
+            'response_times': deque(maxlen=1000)  # Keep only last 1000 measurements
         }
-        self._lock = threading.RLock()
+        # Only guards shard creation and summary snapshots; recording never takes it
+        self._lock = threading.Lock()
+        
+        # Per-thread error_counts / worker_performance shards, merged on read
+        self._shards = {}
+        
+        # QUESTIONS_SCRAPED children by worker_id, resolved on first use
+        self._questions_counters = {}
+    
+    def _local_shard(self) -> Dict:
+        """Return the calling thread's counters, creating them on first use"""
+        thread_id = threading.get_ident()
+        shard = self._shards.get(thread_id)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.setdefault(thread_id, {
+                    'total_questions': 0,  # Running total across this shard's workers
+                    'error_counts': TallyCounter(),
+                    'worker_performance': defaultdict(
+                        lambda: {'total_questions': 0, 'start_time': datetime.now()}
+                    )
+                })
+        return shard
     
     def record_questions_scraped(self, worker_id: str, count: int):
         """Record questions scraped by worker"""
-        with self._lock:
-            QUESTIONS_SCRAPED.labels(worker_id=worker_id).inc(count)
-            
-            if worker_id not in self.metrics['worker_performance']:
-                self.metrics['worker_performance'][worker_id] = {
-                    'total_questions': 0,
-                    'start_time': datetime.now()
-                }
-            
-            self.metrics['worker_performance'][worker_id]['total_questions'] += count
+        counter = self._questions_counters.get(worker_id)
+        if counter is None:
+            counter = self._questions_counters.setdefault(worker_id, QUESTIONS_SCRAPED.labels(worker_id=worker_id))
+        counter.inc(count)
+        
+        shard = self._local_shard()
+        shard['worker_performance'][worker_id]['total_questions'] += count
+        shard['total_questions'] += count
     
     def record_scraping_duration(self, duration_seconds: float):
         """Record time taken for scraping operation"""
         SCRAPING_DURATION.observe(duration_seconds)
         
-        with self._lock:
-            self.metrics['response_times'].append(duration_seconds)
-            
-            # Keep only last 1000 measurements
-            if len(self.metrics['response_times']) > 1000:
-                self.metrics['response_times'] = self.metrics['response_times'][-1000:]
+        # Bounded deque appends are atomic, so no lock is needed
+        self.metrics['response_times'].append(duration_seconds)
     
     def record_error(self, error_type: str):
         """Record an error occurrence"""
+        self._local_shard()['error_counts'][error_type] += 1
+    
+    def get_totals(self) -> Dict:
+        """Get overall question and error totals, summing one running total per recording thread"""
         with self._lock:
-            self.metrics['error_counts'][error_type] = self.metrics['error_counts'].get(error_type, 0) + 1
+            shards = list(self._shards.values())
+        
+        return {
+            'total_questions': sum(shard['total_questions'] for shard in shards),
+            'total_errors': sum(sum(dict(shard['error_counts']).values()) for shard in shards)
+        }
     
     def get_performance_summary(self) -> Dict:
-        """Get performance summary statistics"""
+        """Get performance summary statistics, including the per-worker breakdown"""
         with self._lock:
-            summary = {
-                'total_workers': len(self.metrics['worker_performance']),
-                'total_questions': sum(
-                    worker['total_questions'] 
-                    for worker in self.metrics['worker_performance'].values()
-                ),
-                'avg_response_time': (
-                    sum(self.metrics['response_times']) / len(self.metrics['response_times'])
-                    if self.metrics['response_times'] else 0
-                ),
-                'error_summary': dict(self.metrics['error_counts']),
-                'worker_performance': dict(self.metrics['worker_performance'])
-            }
+            response_times = list(self.metrics['response_times'])
+            shards = list(self._shards.values())
+        
+        # Merge the per-thread shards; dict() copies are atomic, so owners can keep writing
+        error_counts = TallyCounter()
+        worker_performance = {}
+        for shard in shards:
+            error_counts.update(dict(shard['error_counts']))
             
-            return summary
+            for worker_id, worker in dict(shard['worker_performance']).items():
+                merged = worker_performance.setdefault(
+                    worker_id, {'total_questions': 0, 'start_time': worker['start_time']}
+                )
+                merged['total_questions'] += worker['total_questions']
+                merged['start_time'] = min(merged['start_time'], worker['start_time'])
+        
+        # One running total per recording thread, so this sums a handful of ints
+        total_questions = sum(shard['total_questions'] for shard in shards)
+        
+        summary = {
+            'total_workers': len(worker_performance),
+            'total_questions': total_questions,
+            'avg_response_time': (
+                sum(response_times) / len(response_times)
+                if response_times else 0
+            ),
+            'error_summary': dict(error_counts),
+            'worker_performance': worker_performance
+        }
+        
+        return summary
 
 
 # Global instances
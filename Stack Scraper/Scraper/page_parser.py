@@ -0,0 +1,105 @@
+"""
+HTML Parsing for the Asynchronous Stack Overflow Scraper
+Pure functions that turn fetched listing and question pages into question data.
+Kept free of queue and storage imports so they can run in worker processes.
+"""
+
+from typing import List, Dict
+from urllib.parse import urljoin
+
+import lxml.html
+
+
+def _has_class(class_name: str) -> str:
+    """XPath predicate matching elements that carry the given CSS class"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# XPath equivalents of the Selenium selectors, used when parsing fetched HTML
+SUMMARY_XPATH = f"//*[{_has_class('s-post-summary')} or self::div[@data-post-id] or {_has_class('question-summary')}]"
+STATS_XPATH = f".//*[{_has_class('s-post-summary--stats-item-number')}]"
+TITLE_XPATH = f".//h3//a[@href] | .//a[{_has_class('s-link')}][@href]"
+TAG_XPATH = f".//*[{_has_class('s-tag')}]"
+AUTHOR_XPATH = f".//*[{_has_class('s-user-card--link')}]"
+POST_BODY_XPATH = f".//*[{_has_class('s-prose')} and {_has_class('js-post-body')}]"
+ANSWER_XPATH = f"//*[{_has_class('answer')}]"
+VOTE_COUNT_XPATH = f".//*[{_has_class('js-vote-count')}]"
+ACCEPTED_XPATH = f".//*[{_has_class('js-accepted-answer-indicator')}]"
+
+
+def parse_question_list(html: str, page_url: str, scraped_at: str, worker_id: str) -> List[Dict]:
+    """Parse answered questions from a listing page's HTML"""
+    root = lxml.html.fromstring(html)
+    questions = []
+    
+    for index, summary in enumerate(root.xpath(SUMMARY_XPATH), 1):
+        # The stats cells are always votes, answers, views
+        stats = [cell.text_content().strip() for cell in summary.xpath(STATS_XPATH)[:3]]
+        votes, answers, views = stats + ["0"] * (3 - len(stats))
+        
+        # Skip questions without answers
+        try:
+            if int(answers) == 0:
+                continue
+        except ValueError:
+            continue
+        
+        anchors = summary.xpath(TITLE_XPATH)
+        if not anchors:
+            continue
+        
+        authors = summary.xpath(AUTHOR_XPATH)
+        
+        questions.append({
+            "index": index,
+            "title": anchors[0].get("title") or anchors[0].text_content().strip(),
+            "link": urljoin(page_url, anchors[0].get("href")),
+            "votes": votes,
+            "answers": answers,
+            "views": views,
+            "tags": [tag.text_content().strip() for tag in summary.xpath(TAG_XPATH)[:5]],
+            "author": (authors[0].text_content().strip() if authors else "") or "Anonymous",
+            "scraped_at": scraped_at,
+            "worker_id": worker_id
+        })
+    
+    return questions
+
+
+def parse_question_page(html: str) -> Dict:
+    """Parse question and top answer content from a question page's HTML"""
+    full_data = {
+        "question_content": "",
+        "question_code": [],
+        "top_answer_content": "",
+        "top_answer_votes": "0",
+        "top_answer_accepted": False
+    }
+    
+    root = lxml.html.fromstring(html)
+    
+    question_bodies = root.xpath(POST_BODY_XPATH)
+    if question_bodies:
+        question_body = question_bodies[0]
+        full_data["question_content"] = question_body.text_content().strip()[:1000]  # Limit content
+        full_data["question_code"] = [
+            code.text_content().strip() for code in question_body.xpath(".//pre//code")[:3]
+        ]
+    
+    answers = root.xpath(ANSWER_XPATH)
+    if answers:
+        top_answer = answers[0]
+        
+        vote_elements = top_answer.xpath(VOTE_COUNT_XPATH)
+        if vote_elements:
+            full_data["top_answer_votes"] = vote_elements[0].get("data-value") or vote_elements[0].text_content().strip()
+        
+        accepted = top_answer.xpath(ACCEPTED_XPATH)
+        if accepted:
+            full_data["top_answer_accepted"] = "d-none" not in accepted[0].get("class", "")
+        
+        answer_bodies = top_answer.xpath(POST_BODY_XPATH)
+        if answer_bodies:
+            full_data["top_answer_content"] = answer_bodies[0].text_content().strip()[:1000]  # Limit content
+    
+    return full_data
@@ -9,29 +9,290 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, WebDriverException
+import asyncio
+import functools
 import json
+import orjson
 import csv
+import queue
+import threading
 import time
 import random
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Optional
 
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import httpx
+    HTTP_FETCH_AVAILABLE = LXML_AVAILABLE
+except ImportError:
+    HTTP_FETCH_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Minimum gap in seconds between two page loads in the browser, picked at random per load
+REQUEST_INTERVAL_RANGE = (0.5, 1.0)
+
+# Requests the browser never needs for text scraping; stylesheets stay for the element.text fallbacks
+BLOCKED_URL_PATTERNS = [
+    "*.woff2", "*.woff", "*.ttf", "*.otf", "*.eot",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*",
+    "*googlesyndication*", "*adzerk*", "*quantserve*", "*scorecardresearch*",
+]
+
+# Default number of Chrome drivers kept open to scrape question pages in parallel in browser mode
+DRIVER_POOL_SIZE = 4
+
+# Pages a Chrome instance loads before it is restarted to shed accumulated renderer memory
+DRIVER_MAX_PAGES = 50
+
+# Combined RSS of chromedriver and its Chrome processes above which a driver is restarted early
+DRIVER_MAX_RSS_BYTES = 1024 * 1024 * 1024
+
+# Reused scrapers keep their Chrome profiles here, in a directory unique to each scraper,
+# so the HTTP cache survives driver restarts
+CHROME_PROFILE_DIR = os.path.join(tempfile.gettempdir(), "so_scraper_profile")
+
+# Question pages fetched at once when scraping over HTTP instead of through Chrome
+HTTP_CONCURRENCY = 16
+
+# Workers parsing fetched question pages off the event loop, overlapping with the fetches still in flight
+HTML_PARSE_WORKERS = 2
+
+# Keep-alive connections held by each of the HTTP clients, reused across listing pages
+HTTP_POOL_SIZE = 32
+
+# Minimum gap in seconds between two HTTP request starts against Stack Overflow
+HTTP_REQUEST_INTERVAL = 0.2
+
+# CSS selectors for the server-rendered question page, used by the HTTP path
+HTML_QUESTION_BODY_SELECTORS = (
+    ".question .s-prose.js-post-body",
+    ".s-prose.js-post-body",
+    ".question .post-text"
+)
+HTML_ANSWER_SELECTOR = "#answers .answer, .answer.js-answer, [data-answerid]"
+HTML_ANSWER_BODY_SELECTOR = ".s-prose.js-post-body, .post-text"
+HTML_CODE_SELECTOR = "pre code, code.hljs, .s-code-block code"
+
+# Selenium selectors, built once at import; grouped ones are pre-joined for a single find_elements query
+QUESTION_LIST_SELECTORS = (
+    ".s-post-summary",
+    "div[data-post-id]",
+    ".question-summary",
+    "div.s-post-summary--content"
+)
+QUESTION_BODY_SELECTOR = ", ".join((
+    ".question .s-prose.js-post-body",
+    ".postcell .s-prose.js-post-body",
+    ".post-layout--right .s-prose.js-post-body",
+    ".s-prose.js-post-body",
+    ".question .post-text",
+    "[data-s-prose-element='true']"
+))
+QUESTION_CODE_SELECTOR = ", ".join((
+    "pre.lang-py code",  # Python-specific
+    "pre code",
+    "code.hljs",
+    ".s-code-block code",
+    "code"  # fallback
+))
+ANSWER_SELECTORS = (
+    "#answers .answer:first-of-type",
+    ".answer.js-answer:first-of-type",
+    "[data-answerid]:first-of-type",
+    "#answer-8114405"  # fallback for specific answer ID pattern
+)
+ANSWER_ACCEPTED_SELECTORS = (
+    ".js-accepted-answer-indicator",
+    ".accepted-answer",
+    "[class*='accepted']"
+)
+ANSWER_VOTE_SELECTOR = ", ".join((
+    ".js-vote-count[data-value]",
+    ".votecell .js-vote-count",
+    "[data-score]",
+    ".js-voting-container .js-vote-count"
+))
+ANSWER_BODY_SELECTOR = ", ".join((
+    ".answercell .s-prose.js-post-body",
+    ".post-layout--right .s-prose.js-post-body",
+    ".s-prose.js-post-body",
+    ".answercell .post-text"
+))
+ANSWER_CODE_SELECTOR = ", ".join((
+    "pre.lang-py code",  # Python-specific code blocks
+    "pre code",
+    "code.hljs",
+    ".s-code-block code"
+))
+
+
+@functools.lru_cache(maxsize=256)
+def _compiled_selector(selector: str) -> "CSSSelector":
+    """CSS selector translated to XPath once and reused for every lxml query"""
+    return CSSSelector(selector)
+
+
+# Fallback selectors for each listing field, tried in order inside the browser
+QUESTION_SUMMARY_SELECTORS = {
+    "title": (
+        "h3.s-post-summary--content-title a",
+        ".s-post-summary--content h3 a",
+        ".s-post-summary--content-title a",
+        "h3 a.s-link",
+        ".question-hyperlink",
+        "a.s-link"
+    ),
+    "votes": (
+        ".s-post-summary--stats-item-number",
+        ".vote-count-post",
+        "[title*='vote']",
+        ".js-vote-count"
+    ),
+    "answers": (
+        ".s-post-summary--stats-item[title*='answer'] .s-post-summary--stats-item-number",
+        ".status strong",
+        "[title*='answer']",
+        ".js-answer-count"
+    ),
+    "views": (
+        ".views",
+        "[title*='view']",
+        ".js-view-count"
+    ),
+    "tags": (
+        ".s-tag.post-tag",
+        ".s-tag",
+        ".post-tag",
+        "a[href*='/questions/tagged/']",
+        ".js-tagname-python, .js-tagname-javascript, .js-tagname-html, .js-tagname-css"
+    ),
+    "author": (
+        ".s-user-card--link a",
+        ".s-user-card--info .s-user-card--link a",
+        ".s-user-card--link",
+        ".user-details a",
+        "a[href*='/users/']"
+    ),
+    "excerpt": (
+        ".s-post-summary--content-excerpt",
+        ".excerpt",
+        ".summary"
+    ),
+    "timestamp": (
+        ".s-user-card--time .relativetime",
+        ".relativetime",
+        "time[title]"
+    )
+}
+
+# Listing stats numbers in page order; read positionally instead of through :nth-child selectors
+QUESTION_STATS_SELECTOR = ".s-post-summary--stats-item-number"
+QUESTION_STATS_FIELDS = ("votes", "answers", "views")
+
+# Reads all listing fields of every question summary on the page in one round-trip,
+# mirroring the per-selector fallbacks
+QUESTION_LISTING_JS = """
+const [listSelector, sel, statsSelector, statsFields] = arguments;
+const textOf = (node) => (node.textContent || node.innerText || node.innerHTML || '').trim();
+const summarize = (root) => {
+    const firstText = (selectors) => {
+        for (const selector of selectors) {
+            const node = root.querySelector(selector);
+            const text = node ? textOf(node) : '';
+            if (text) return text;
+        }
+        return null;
+    };
+    const fields = {title: null, link: null, tags: []};
+    for (const selector of sel.title) {
+        const anchor = root.querySelector(selector);
+        if (anchor) {
+            fields.title = anchor.getAttribute('title') || textOf(anchor);
+            fields.link = anchor.href || null;
+            break;
+        }
+    }
+    for (const selector of sel.tags) {
+        const tags = Array.from(root.querySelectorAll(selector), textOf).filter(Boolean);
+        if (tags.length) { fields.tags = tags; break; }
+    }
+    const stats = Array.from(root.querySelectorAll(statsSelector), textOf);
+    for (const key of ['votes', 'answers', 'views', 'author', 'excerpt', 'timestamp']) {
+        const position = statsFields.indexOf(key);
+        fields[key] = (stats.length === statsFields.length && stats[position]) || firstText(sel[key]);
+    }
+    return fields;
+};
+return Array.from(document.querySelectorAll(listSelector), summarize);
+"""
+
 
 class StackOverflowScraper:
     """Main scraper class for Stack Overflow"""
     
-    def __init__(self, headless: bool = False, timeout: int = 15):
+    def __init__(self, headless: bool = False, timeout: int = 15, use_browser: bool = False,
+                 reuse_driver: bool = False, parallel_pages: int = DRIVER_POOL_SIZE, http2: bool = True):
         """
         Initialize the scraper
         
         Args:
             headless: Run browser in headless mode
-            timeout: Default timeout for WebDriver waits
+            timeout: Default timeout for WebDriver waits and HTTP requests
+            use_browser: Drive Chrome instead of fetching the server-rendered HTML directly
+            reuse_driver: Keep Chrome open between scrape runs; call cleanup() when done
+            parallel_pages: Browser instances loading question pages at once in browser mode
+            http2: Negotiate HTTP/2 when fetching over HTTP; turn off for HTTP/1.1-only proxies and recorders
         """
         self.headless = headless
         self.timeout = timeout
+        self.use_browser = use_browser or not HTTP_FETCH_AVAILABLE
+        self.reuse_driver = reuse_driver
+        self.parallel_pages = max(1, parallel_pages)
+        self.http2 = http2
         self.driver = None
         self.wait = None
+        self._http_client = None
+        self._async_client = None
+        self._event_loop = None
+        self._next_http_time = 0.0
+        self._listing_tree = None
+        self._resolved_selectors = {}
+        self._next_request_time = 0.0
+        self._throttle_lock = threading.Lock()
+        self._driver_pool = None
+        self._pool_drivers = []
+        self._pool_lock = threading.Lock()
+        self._driver_profiles = {}
+        self._pages_on_driver = {}
+        self._profile_root = None
+        self._profile_lock = threading.Lock()
+        self._jsonl_file = None
         self.scraped_ids_file = "scraped_question_ids.txt"
         self.scraped_ids = set()
         self.persistent_json_file = "stackoverflow_questions_persistent.json"
@@ -74,8 +335,8 @@ class StackOverflowScraper:
     def load_existing_json_data(self) -> List[Dict]:
         """Load existing data from persistent JSON file"""
         try:
-            with open(self.persistent_json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self.persistent_json_file, 'rb') as f:
+                data = orjson.loads(f.read())
             print(f"📚 Loaded {len(data)} existing questions from {self.persistent_json_file}")
             return data
         except FileNotFoundError:
@@ -88,17 +349,30 @@ class StackOverflowScraper:
     def save_to_persistent_json(self, all_data: List[Dict]) -> bool:
         """Save all data to the persistent JSON file"""
         try:
-            with open(self.persistent_json_file, 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, indent=2, ensure_ascii=False)
+            with open(self.persistent_json_file, 'wb') as f:
+                f.write(orjson.dumps(all_data, option=orjson.OPT_INDENT_2))
             return True
         except Exception as e:
             print(f"❌ Error saving to persistent JSON: {e}")
             return False
     
     def setup_driver(self) -> webdriver.Chrome:
-        """Create and configure Chrome WebDriver"""
+        """Create and configure Chrome WebDriver, or return the one this scraper already has open"""
+        if self.driver is not None:
+            return self.driver
+        
+        driver = self._create_driver("main")
+        self.wait = WebDriverWait(driver, self.timeout)
+        return driver
+    
+    def _create_driver(self, profile: str) -> webdriver.Chrome:
+        """Launch a configured Chrome instance without binding it to this scraper"""
         chrome_options = Options()
         
+        # Persistent per-driver profile so cached assets survive restarts of a reused driver
+        if self.reuse_driver:
+            chrome_options.add_argument(f"--user-data-dir={self._profile_dir(profile)}")
+        
         # Headless mode
         if self.headless:
             chrome_options.add_argument("--headless")
@@ -116,7 +390,7 @@ class StackOverflowScraper:
         chrome_options.add_argument("--disable-logging")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")  # Speed up loading by not loading images
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")  # Speed up loading by not loading images
         chrome_options.add_argument("--silent")
         chrome_options.add_argument("--log-level=3")  # Only show fatal errors
         chrome_options.add_argument("--disable-background-timer-throttling")
@@ -135,12 +409,137 @@ class StackOverflowScraper:
                 "userAgent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             })
             
-            self.wait = WebDriverWait(driver, self.timeout)
+            # Drop fonts, images, media, analytics and ads before they hit the wire
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": BLOCKED_URL_PATTERNS})
+            
+            self._driver_profiles[id(driver)] = profile
+            self._pages_on_driver[id(driver)] = 0
             return driver
             
         except Exception as e:
             raise WebDriverException(f"Failed to initialize Chrome driver: {str(e)}")
     
+    def _profile_dir(self, profile: str) -> str:
+        """
+        Path of a Chrome profile owned by this scraper
+        
+        Chrome refuses a profile another process already has open, so each scraper
+        gets its own directory rather than sharing fixed names with other scrapers.
+        
+        Args:
+            profile: Driver name, "main" or "pool-N"
+            
+        Returns:
+            Profile directory under this scraper's root in CHROME_PROFILE_DIR
+        """
+        with self._profile_lock:
+            if self._profile_root is None:
+                os.makedirs(CHROME_PROFILE_DIR, exist_ok=True)
+                self._profile_root = tempfile.mkdtemp(prefix=f"{os.getpid()}-", dir=CHROME_PROFILE_DIR)
+            return os.path.join(self._profile_root, profile)
+    
+    def _recycle_if_worn(self, driver: webdriver.Chrome) -> webdriver.Chrome:
+        """
+        Count a page load on the driver, restarting it once it has served DRIVER_MAX_PAGES
+        or its processes have grown past DRIVER_MAX_RSS_BYTES
+        
+        Args:
+            driver: Driver about to load a page
+            
+        Returns:
+            The same driver, or its fresh replacement on the same profile
+        """
+        pages = self._pages_on_driver.get(id(driver), 0) + 1
+        if pages > DRIVER_MAX_PAGES:
+            reason = f"after {DRIVER_MAX_PAGES} pages"
+        else:
+            rss = self._driver_rss(driver)
+            if rss <= DRIVER_MAX_RSS_BYTES:
+                self._pages_on_driver[id(driver)] = pages
+                return driver
+            reason = f"at {rss / (1024 * 1024):.0f}MB RSS"
+        
+        profile = self._driver_profiles.pop(id(driver), "main")
+        self._pages_on_driver.pop(id(driver), None)
+        print(f"  ♻️  Restarting browser '{profile}' {reason}")
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Warning: Error closing browser: {str(e)}")
+        
+        fresh = self._create_driver(profile)
+        self._pages_on_driver[id(fresh)] = 1
+        if driver is self.driver:
+            self.driver = fresh
+            self.wait = WebDriverWait(fresh, self.timeout)
+        else:
+            # Pool threads can restart drivers at the same time; swap under the lock so none is lost
+            with self._pool_lock:
+                self._pool_drivers = [fresh if d is driver else d for d in self._pool_drivers]
+        return fresh
+    
+    @staticmethod
+    def _driver_rss(driver: webdriver.Chrome) -> int:
+        """Resident memory of chromedriver plus every Chrome process it spawned, 0 if unknown"""
+        if not PSUTIL_AVAILABLE:
+            return 0
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            rss = root.memory_info().rss
+            for child in root.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.NoSuchProcess:
+                    continue
+            return rss
+        except (AttributeError, psutil.Error):
+            return 0
+    
+    def _reset_session(self) -> None:
+        """Clear per-run browser state so a reused driver starts the next run clean"""
+        try:
+            self.driver.get("about:blank")
+            self.driver.delete_all_cookies()
+        except Exception as e:
+            print(f"Warning: Error resetting browser session: {str(e)}")
+            self.cleanup()
+    
+    def _throttle(self) -> None:
+        """Space browser page loads at least REQUEST_INTERVAL_RANGE apart"""
+        with self._throttle_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_request_time)
+            self._next_request_time = slot + random.uniform(*REQUEST_INTERVAL_RANGE)
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def _get_http_client(self) -> "httpx.Client":
+        """Keep-alive HTTP client shared by every listing page request"""
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                http2=self.http2, headers={"User-Agent": USER_AGENT}, timeout=self.timeout, follow_redirects=True,
+                limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+            )
+        return self._http_client
+    
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """Async client for question pages, kept on one event loop so its pool outlives each batch"""
+        if self._async_client is None:
+            self._event_loop = asyncio.new_event_loop()
+            self._async_client = httpx.AsyncClient(
+                http2=self.http2, headers={"User-Agent": USER_AGENT}, timeout=self.timeout, follow_redirects=True,
+                limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+            )
+        return self._async_client
+    
+    def _reserve_http_slot(self) -> float:
+        """Claim the next HTTP request start time and return how long to wait for it"""
+        now = time.monotonic()
+        slot = max(now, self._next_http_time)
+        self._next_http_time = slot + HTTP_REQUEST_INTERVAL
+        return slot - now
+    
     def navigate_to_stackoverflow(self, url: str = "https://stackoverflow.com") -> bool:
         """
         Navigate to Stack Overflow
@@ -151,8 +550,13 @@ class StackOverflowScraper:
         Returns:
             bool: Success status
         """
+        if not self.use_browser:
+            return self._fetch_listing(url)
+        
         try:
             print(f"Navigating to {url}...")
+            self._recycle_if_worn(self.driver)
+            self._throttle()
             self.driver.get(url)
             
             # Wait for page to load
@@ -168,6 +572,24 @@ class StackOverflowScraper:
             print(f"Error navigating to {url}: {str(e)}")
             return False
     
+    def _fetch_listing(self, url: str) -> bool:
+        """Fetch a listing page over HTTP and keep its parsed tree for extract_questions"""
+        try:
+            print(f"Fetching {url}...")
+            time.sleep(self._reserve_http_slot())
+            response = self._get_http_client().get(url)
+            response.raise_for_status()
+            self._listing_tree = lxml.html.fromstring(response.text, base_url=str(response.url))
+            self._listing_tree.make_links_absolute()
+            
+            title = self._listing_tree.findtext(".//title") or url
+            print(f"Successfully loaded: {title.strip()}")
+            return True
+            
+        except Exception as e:
+            print(f"Error fetching {url}: {str(e)}")
+            return False
+    
     def extract_questions(self, max_questions: int = 10) -> List[Dict]:
         """
         Extract questions from the current page
@@ -185,19 +607,30 @@ class StackOverflowScraper:
             print("Waiting for questions to load...")
             
             # Try multiple selectors for questions - updated for current SO structure
-            question_selectors = [
-                ".s-post-summary",
-                "div[data-post-id]",
-                ".question-summary",
-                "div.s-post-summary--content"
-            ]
-            
             questions = None
-            for selector in question_selectors:
+            for selector in self._ordered_selectors("listing", QUESTION_LIST_SELECTORS):
+                if not self.use_browser:
+                    nodes = _compiled_selector(selector)(self._listing_tree) if self._listing_tree is not None else []
+                    if nodes:
+                        questions = [self._summary_fields_from_html(node) for node in nodes]
+                        self._resolved_selectors["listing"] = selector
+                        print(f"Found questions using selector: {selector}")
+                        break
+                    continue
                 try:
-                    questions = self.wait.until(
+                    self.wait.until(
                         EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
                     )
+                    if LXML_AVAILABLE:
+                        # Snapshot the rendered page once and parse every listing field offline
+                        tree = lxml.html.fromstring(self.driver.page_source, base_url=self.driver.current_url)
+                        tree.make_links_absolute()
+                        questions = [self._summary_fields_from_html(node) for node in _compiled_selector(selector)(tree)]
+                    else:
+                        # Every listing field of every question is read inside the browser in a single round-trip
+                        questions = self.driver.execute_script(QUESTION_LISTING_JS, selector, QUESTION_SUMMARY_SELECTORS,
+                                                               QUESTION_STATS_SELECTOR, QUESTION_STATS_FIELDS)
+                    self._resolved_selectors["listing"] = selector
                     print(f"Found questions using selector: {selector}")
                     break
                 except TimeoutException:
@@ -209,9 +642,10 @@ class StackOverflowScraper:
             
             print(f"Processing {min(len(questions), max_questions)} questions...")
             
-            processed_count = 0
+            # Read every listing entry before visiting any question page
+            candidates = []
             for i, question in enumerate(questions):
-                if processed_count >= max_questions:
+                if len(candidates) >= max_questions:
                     break
                     
                 try:
@@ -223,92 +657,264 @@ class StackOverflowScraper:
                             print(f"  ⏭️  Skipping question {i + 1} - already scraped (ID: {question_id})")
                             continue
                         
-                        # Scrape full question and answer content
-                        print(f"  🔗 Clicking on question {i + 1}: {question_data['title'][:60]}... (ID: {question_id})")
-                        full_content = self.scrape_full_question_and_answer(question_data['link'])
-                        
-                        # Merge full content with basic data
-                        question_data.update(full_content)
                         question_data['question_id'] = question_id  # Add question ID to data
-                        questions_data.append(question_data)
-                        processed_count += 1
-                        
-                        # Log the question ID
-                        if question_id:
-                            self.save_scraped_id(question_id)
-                        
-                        # Save to persistent JSON incrementally
-                        if hasattr(self, 'persistent_data'):
-                            formatted_question = self.convert_to_new_format(question_data)
-                            self.persistent_data.append(formatted_question)
-                            self.save_to_persistent_json(self.persistent_data)
-                            print(f"  💾 Added to persistent JSON (Total: {len(self.persistent_data)} questions)")
-                        
-                        # Random delay between questions
-                        delay = random.uniform(3, 7)
-                        print(f"  ⏰ Waiting {delay:.1f}s before next question...")
-                        time.sleep(delay)
+                        candidates.append(question_data)
                         
                 except Exception as e:
                     print(f"Error extracting question {i + 1}: {str(e)}")
                     continue
             
+            # Scrape full question and answer content
+            full_contents = self._scrape_full_contents(candidates)
+            
+            for question_data, full_content in zip(candidates, full_contents):
+                try:
+                    question_id = question_data['question_id']
+                    
+                    # Merge full content with basic data
+                    question_data.update(full_content)
+                    questions_data.append(question_data)
+                    
+                    # Stream the question out as soon as it is complete
+                    if self._jsonl_file is not None:
+                        self._jsonl_file.write(orjson.dumps(question_data) + b"\n")
+                        self._jsonl_file.flush()
+                    
+                    # Log the question ID
+                    if question_id:
+                        self.save_scraped_id(question_id)
+                    
+                    # Save to persistent JSON incrementally
+                    if hasattr(self, 'persistent_data'):
+                        formatted_question = self.convert_to_new_format(question_data)
+                        self.persistent_data.append(formatted_question)
+                        self.save_to_persistent_json(self.persistent_data)
+                        print(f"  💾 Added to persistent JSON (Total: {len(self.persistent_data)} questions)")
+                        
+                except Exception as e:
+                    print(f"Error saving question {question_data.get('index')}: {str(e)}")
+                    continue
+            
             return questions_data
             
         except Exception as e:
             print(f"Error extracting questions: {str(e)}")
             return questions_data
     
-    def _extract_question_data(self, question_element, index: int) -> Optional[Dict]:
+    def _scrape_full_contents(self, questions: List[Dict]) -> List[Dict]:
+        """
+        Scrape full content for each question, concurrently over HTTP when available
+        
+        Args:
+            questions: Listing data for the questions to scrape
+            
+        Returns:
+            Full content dictionaries in the same order as the questions
+        """
+        if not questions:
+            return []
+        
+        if not self.use_browser:
+            print(f"  🌐 Fetching {len(questions)} question pages over HTTP...")
+            client = self._get_async_client()
+            return self._event_loop.run_until_complete(
+                self._fetch_questions_async(client, [q['link'] for q in questions])
+            )
+        
+        pool = self._get_driver_pool()
+        
+        def scrape_with_pooled_driver(question_data: Dict) -> Dict:
+            driver = self._recycle_if_worn(pool.get())
+            try:
+                print(f"  🔗 Clicking on question {question_data['index']}: {question_data['title'][:60]}... (ID: {question_data['question_id']})")
+                return self.scrape_full_question_and_answer(question_data['link'], driver)
+            finally:
+                pool.put(driver)
+        
+        with ThreadPoolExecutor(max_workers=self.parallel_pages) as executor:
+            return list(executor.map(scrape_with_pooled_driver, questions))
+    
+    def _get_driver_pool(self) -> queue.Queue:
+        """Lazily start parallel_pages Chrome drivers, kept open until cleanup"""
+        if self._driver_pool is None:
+            print(f"  🚗 Starting {self.parallel_pages} browser instances for question pages...")
+            with ThreadPoolExecutor(max_workers=self.parallel_pages) as executor:
+                self._pool_drivers = list(executor.map(lambda i: self._create_driver(f"pool-{i}"), range(self.parallel_pages)))
+            self._driver_pool = queue.Queue()
+            for driver in self._pool_drivers:
+                self._driver_pool.put(driver)
+        return self._driver_pool
+    
+    async def _fetch_questions_async(self, client: "httpx.AsyncClient", urls: List[str]) -> List[Dict]:
+        """
+        Fetch and parse question pages as a two-stage pipeline
+        
+        HTTP_CONCURRENCY fetch workers feed raw pages through a queue to HTML_PARSE_WORKERS
+        parse workers, which parse in a thread so fetching never waits on parsing.
+        
+        Args:
+            client: Shared HTTP/2 client
+            urls: Question page URLs
+            
+        Returns:
+            Full content dictionaries in the same order as the URLs
+        """
+        url_queue = asyncio.Queue()
+        html_queue = asyncio.Queue()
+        results = [None] * len(urls)
+        
+        for position, url in enumerate(urls):
+            url_queue.put_nowait((position, url))
+        
+        fetchers = [asyncio.create_task(self._fetch_worker(client, url_queue, html_queue))
+                    for _ in range(min(HTTP_CONCURRENCY, len(urls)))]
+        parsers = [asyncio.create_task(self._parse_worker(html_queue, results))
+                   for _ in range(HTML_PARSE_WORKERS)]
+        
+        await asyncio.gather(*fetchers)
+        for _ in parsers:
+            html_queue.put_nowait(None)
+        await asyncio.gather(*parsers)
+        
+        return [result if result is not None else self._empty_full_data() for result in results]
+    
+    async def _fetch_worker(self, client: "httpx.AsyncClient", url_queue: asyncio.Queue, html_queue: asyncio.Queue) -> None:
+        """Download question pages until the URL queue is drained"""
+        while not url_queue.empty():
+            position, url = url_queue.get_nowait()
+            try:
+                delay = self._reserve_http_slot()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                print(f"  📖 Loading question page: {url}")
+                response = await client.get(url)
+                response.raise_for_status()
+                await html_queue.put((position, response.text))
+            except Exception as e:
+                print(f"  ❌ Error scraping full content: {str(e)}")
+    
+    async def _parse_worker(self, html_queue: asyncio.Queue, results: List[Optional[Dict]]) -> None:
+        """Parse fetched pages in a worker thread until a None sentinel arrives"""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await html_queue.get()
+            if item is None:
+                return
+            position, html = item
+            try:
+                results[position] = await loop.run_in_executor(None, self._parse_question_html, html)
+            except Exception as e:
+                print(f"  ❌ Error parsing full content: {str(e)}")
+    
+    @staticmethod
+    def _empty_full_data() -> Dict:
+        """Full content defaults used when a question page yields nothing"""
+        return {
+            "question_content": "",
+            "question_code": [],
+            "top_answer_content": "",
+            "top_answer_code": [],
+            "top_answer_votes": "0",
+            "top_answer_accepted": False
+        }
+    
+    def _parse_question_html(self, html: str) -> Dict:
+        """
+        Parse full question content and the top answer from question page HTML
+        
+        Args:
+            html: Server-rendered question page
+            
+        Returns:
+            Dictionary with full question and answer data
+        """
+        full_data = self._empty_full_data()
+        
+        # Lexbor when installed, lxml otherwise; both are driven through the same three accessors
+        if SELECTOLAX_AVAILABLE:
+            root = LexborHTMLParser(html)
+            select = lambda node, selector: node.css(selector)
+            text_of = lambda node: node.text().strip()
+            attr_of = lambda node, name: node.attributes.get(name) or ""
+        else:
+            root = lxml.html.fromstring(html)
+            select = lambda node, selector: _compiled_selector(selector)(node)
+            text_of = lambda node: node.text_content().strip()
+            attr_of = lambda node, name: node.get(name, "")
+        
+        code_blocks = lambda body, selector, min_length=1: self._unique_code_texts(
+            map(text_of, select(body, selector)), min_length
+        )
+        
+        for selector in self._ordered_selectors("html_question_body", HTML_QUESTION_BODY_SELECTORS):
+            bodies = select(root, selector)
+            if bodies:
+                self._resolved_selectors["html_question_body"] = selector
+                full_data["question_content"] = text_of(bodies[0])
+                # Only keep substantial code blocks (not inline single words)
+                full_data["question_code"] = code_blocks(bodies[0], "code", min_length=4)
+                break
+        
+        answers = select(root, HTML_ANSWER_SELECTOR)
+        if answers:
+            top_answer = answers[0]
+            
+            accepted = select(top_answer, ".js-accepted-answer-indicator")
+            if accepted:
+                full_data["top_answer_accepted"] = "d-none" not in attr_of(accepted[0], "class")
+            
+            votes = select(top_answer, ".js-vote-count")
+            if votes:
+                full_data["top_answer_votes"] = attr_of(votes[0], "data-value") or text_of(votes[0]) or "0"
+            
+            answer_bodies = select(top_answer, HTML_ANSWER_BODY_SELECTOR)
+            if answer_bodies:
+                full_data["top_answer_content"] = text_of(answer_bodies[0])
+                full_data["top_answer_code"] = code_blocks(answer_bodies[0], HTML_CODE_SELECTOR)
+        
+        return full_data
+    
+    @staticmethod
+    def _element_code_blocks(body, selector: str, min_length: int = 1) -> List[str]:
+        """Collect unique code block texts under a WebElement with one find_elements query"""
+        return StackOverflowScraper._unique_code_texts(
+            (StackOverflowScraper._text_content(code_elem) for code_elem in body.find_elements(By.CSS_SELECTOR, selector)),
+            min_length
+        )
+    
+    @staticmethod
+    def _text_content(element) -> str:
+        """Raw DOM text of a WebElement, skipping the layout and visibility pass behind element.text"""
+        text = (element.get_attribute("textContent") or "").strip()
+        return text or element.text.strip()
+    
+    @staticmethod
+    def _unique_code_texts(texts, min_length: int) -> List[str]:
+        """Strip and de-duplicate code texts, keeping first-seen order"""
+        code_blocks = []
+        seen = set()
+        for code_text in texts:
+            code_text = code_text.strip()
+            if len(code_text) >= min_length and code_text not in seen:
+                seen.add(code_text)
+                code_blocks.append(code_text)
+        return code_blocks
+    
+    def _extract_question_data(self, fields: Dict, index: int) -> Optional[Dict]:
         """
-        Extract data from a single question element
+        Build question data from the raw listing fields of a single question
         
         Args:
-            question_element: Selenium WebElement for the question
+            fields: Listing fields read by QUESTION_LISTING_JS or _summary_fields_from_html
             index: Question index number
             
         Returns:
             Dictionary with question data or None if extraction fails
         """
         try:
-            # Extract title and link - updated selectors for current SO structure
-            title_selectors = [
-                "h3.s-post-summary--content-title a",
-                ".s-post-summary--content h3 a",
-                ".s-post-summary--content-title a", 
-                "h3 a.s-link",
-                ".question-hyperlink",
-                "a.s-link"
-            ]
-            
-            title_element = None
-            title = "N/A"
-            link = "N/A"
-            
-            for selector in title_selectors:
-                try:
-                    title_element = question_element.find_element(By.CSS_SELECTOR, selector)
-                    title = title_element.get_attribute("title") or title_element.text.strip()
-                    link = title_element.get_attribute("href") or "N/A"
-                    break
-                except:
-                    continue
-            
-            # Extract additional metadata - updated for current SO structure
-            vote_count = self._safe_extract_text(question_element, [
-                ".s-post-summary--stats-item-number",
-                ".vote-count-post",
-                "[title*='vote']",
-                ".js-vote-count"
-            ], "0")
-            
-            answer_count = self._safe_extract_text(question_element, [
-                ".s-post-summary--stats-item[title*='answer'] .s-post-summary--stats-item-number",
-                ".s-post-summary--stats-item:nth-child(2) .s-post-summary--stats-item-number",
-                ".status strong",
-                "[title*='answer']",
-                ".js-answer-count"
-            ], "0")
+            title = fields.get("title") or "N/A"
+            link = fields.get("link") or "N/A"
+            answer_count = fields.get("answers") or "0"
             
             # Skip questions without answers
             try:
@@ -320,70 +926,19 @@ class StackOverflowScraper:
                 print(f"  ⏭️  Skipping question {index} - invalid answer count: '{answer_count}'")
                 return None
             
-            view_count = self._safe_extract_text(question_element, [
-                ".s-post-summary--stats-item:nth-child(3) .s-post-summary--stats-item-number",
-                ".views",
-                "[title*='view']",
-                ".js-view-count"
-            ], "0")
-            
-            # Extract tags - updated for current SO structure  
-            tags = []
-            try:
-                tag_selectors = [
-                    ".s-tag.post-tag",
-                    ".s-tag",
-                    ".post-tag",
-                    "a[href*='/questions/tagged/']",
-                    ".js-tagname-python, .js-tagname-javascript, .js-tagname-html, .js-tagname-css"
-                ]
-                
-                for selector in tag_selectors:
-                    try:
-                        tag_elements = question_element.find_elements(By.CSS_SELECTOR, selector)
-                        if tag_elements:
-                            tags = [tag.text.strip() for tag in tag_elements if tag.text.strip()]
-                            if tags:  # If we found tags, break
-                                break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Extract author info - updated for s-user-card structure
-            author = self._safe_extract_text(question_element, [
-                ".s-user-card--link a",
-                ".s-user-card--info .s-user-card--link a", 
-                ".s-user-card--link",
-                ".user-details a",
-                "a[href*='/users/']"
-            ], "Anonymous")
-            
-            # Extract excerpt/description
-            excerpt = self._safe_extract_text(question_element, [
-                ".s-post-summary--content-excerpt",
-                ".excerpt",
-                ".summary"
-            ], "")
-            
-            # Extract timestamp
-            timestamp = self._safe_extract_text(question_element, [
-                ".s-user-card--time .relativetime",
-                ".relativetime",
-                "time[title]"
-            ], "")
+            excerpt = fields.get("excerpt") or ""
             
             return {
                 "index": index,
                 "title": title,
                 "link": link,
-                "votes": vote_count,
+                "votes": fields.get("votes") or "0",
                 "answers": answer_count,
-                "views": view_count,
-                "tags": tags,
-                "author": author,
+                "views": fields.get("views") or "0",
+                "tags": fields.get("tags") or [],
+                "author": fields.get("author") or "Anonymous",
                 "excerpt": excerpt[:200] + "..." if len(excerpt) > 200 else excerpt,  # Limit excerpt length
-                "timestamp": timestamp,
+                "timestamp": fields.get("timestamp") or "",
                 "scraped_at": datetime.now().isoformat()
             }
             
@@ -391,6 +946,59 @@ class StackOverflowScraper:
             print(f"Error extracting question data: {str(e)}")
             return None
     
+    def _ordered_selectors(self, field: str, selectors) -> tuple:
+        """
+        Fallback selectors for a field, with the one that matched last time tried first
+        
+        Args:
+            field: Key the winning selector is cached under in _resolved_selectors
+            selectors: Fallback selectors in their default order
+            
+        Returns:
+            Selectors to try; if the cached winner misses, the rest follow so the field re-resolves
+        """
+        winner = self._resolved_selectors.get(field)
+        if winner is None:
+            return tuple(selectors)
+        return (winner,) + tuple(selector for selector in selectors if selector != winner)
+    
+    def _summary_fields_from_html(self, root) -> Dict:
+        """lxml counterpart of QUESTION_LISTING_JS for one summary, applying the same per-field fallbacks"""
+        text_of = lambda node: node.text_content().strip()
+        fields = {"title": None, "link": None, "tags": []}
+        
+        for selector in self._ordered_selectors("title", QUESTION_SUMMARY_SELECTORS["title"]):
+            anchors = _compiled_selector(selector)(root)
+            if anchors:
+                fields["title"] = anchors[0].get("title") or text_of(anchors[0])
+                fields["link"] = anchors[0].get("href")
+                self._resolved_selectors["title"] = selector
+                break
+        
+        for selector in self._ordered_selectors("tags", QUESTION_SUMMARY_SELECTORS["tags"]):
+            tags = [text for text in map(text_of, _compiled_selector(selector)(root)) if text]
+            if tags:
+                fields["tags"] = tags
+                self._resolved_selectors["tags"] = selector
+                break
+        
+        stats = [text_of(node) for node in _compiled_selector(QUESTION_STATS_SELECTOR)(root)]
+        positional = dict(zip(QUESTION_STATS_FIELDS, stats)) if len(stats) == len(QUESTION_STATS_FIELDS) else {}
+        
+        for key in ("votes", "answers", "views", "author", "excerpt", "timestamp"):
+            fields[key] = positional.get(key) or None
+            if fields[key]:
+                continue
+            for selector in self._ordered_selectors(key, QUESTION_SUMMARY_SELECTORS[key]):
+                nodes = _compiled_selector(selector)(root)
+                text = text_of(nodes[0]) if nodes else ""
+                if text:
+                    fields[key] = text
+                    self._resolved_selectors[key] = selector
+                    break
+        
+        return fields
+    
     def navigate_to_page(self, page_number: int) -> bool:
         """
         Navigate to a specific page of Stack Overflow questions
@@ -409,177 +1017,97 @@ class StackOverflowScraper:
             print(f"Error navigating to page {page_number}: {str(e)}")
             return False
     
-    def scrape_full_question_and_answer(self, question_url: str) -> Dict:
+    def scrape_full_question_and_answer(self, question_url: str, driver: Optional[webdriver.Chrome] = None) -> Dict:
         """
         Navigate to a question page and scrape full content including top answer
         
         Args:
             question_url: URL of the question page
+            driver: Browser to load the page in, defaults to the scraper's own driver
             
         Returns:
             Dictionary with full question and answer data
         """
-        full_data = {
-            "question_content": "",
-            "question_code": [],
-            "top_answer_content": "",
-            "top_answer_code": [],
-            "top_answer_votes": "0",
-            "top_answer_accepted": False
-        }
+        full_data = self._empty_full_data()
+        if driver is None or driver is self.driver:
+            driver, wait = self._recycle_if_worn(self.driver), self.wait
+        else:
+            wait = WebDriverWait(driver, self.timeout)
         
         try:
             print(f"  📖 Loading question page: {question_url}")
-            self.driver.get(question_url)
+            self._throttle()
+            driver.get(question_url)
             
-            # Random delay to appear more human-like
-            delay = random.uniform(2, 5)
-            time.sleep(delay)
+            # Wait only until the question body has rendered
+            try:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, QUESTION_BODY_SELECTOR)))
+            except TimeoutException:
+                pass
             
-            # Wait for page to load
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            if SELECTOLAX_AVAILABLE or LXML_AVAILABLE:
+                # Snapshot the page once and parse question, answer and code blocks offline
+                return self._parse_question_html(driver.page_source)
             
-            # Extract full question content - improved selectors
-            question_selectors = [
-                ".question .s-prose.js-post-body",
-                ".postcell .s-prose.js-post-body", 
-                ".post-layout--right .s-prose.js-post-body",
-                ".s-prose.js-post-body",
-                ".question .post-text",
-                "[data-s-prose-element='true']"
-            ]
-            
-            for selector in question_selectors:
+            # Extract full question content - improved selectors, grouped into one query
+            question_body = self._first_element(driver, QUESTION_BODY_SELECTOR)
+            if question_body is None:
+                print("    ❌ Question body not found")
+            else:
                 try:
-                    question_body = self.driver.find_element(By.CSS_SELECTOR, selector)
                     # Extract text content
-                    full_data["question_content"] = question_body.text.strip()
-                    
-                    # Extract code blocks with multiple selector strategies
-                    code_selectors = [
-                        "pre.lang-py code",  # Python-specific
-                        "pre code", 
-                        "code.hljs",
-                        ".s-code-block code",
-                        "code"  # fallback
-                    ]
+                    full_data["question_content"] = self._text_content(question_body)
                     
-                    all_code_blocks = []
-                    for code_sel in code_selectors:
-                        try:
-                            code_elements = question_body.find_elements(By.CSS_SELECTOR, code_sel)
-                            for code_elem in code_elements:
-                                code_text = code_elem.text.strip()
-                                # Only add substantial code blocks (not inline single words)
-                                if code_text and len(code_text) > 3 and code_text not in all_code_blocks:
-                                    all_code_blocks.append(code_text)
-                        except:
-                            continue
-                    
-                    full_data["question_code"] = all_code_blocks
+                    # Extract code blocks, only substantial ones (not inline single words)
+                    full_data["question_code"] = self._element_code_blocks(question_body, QUESTION_CODE_SELECTOR, min_length=4)
                     
                     print(f"    ✅ Found question content (length: {len(full_data['question_content'])})")
                     print(f"    💻 Question code blocks found: {len(full_data['question_code'])}")
-                    break
                 except Exception as e:
-                    print(f"    ❌ Question extraction error with {selector}: {str(e)}")
-                    continue
+                    print(f"    ❌ Question extraction error: {str(e)}")
             
             # Extract top answer - Updated selectors based on current HTML structure
-            answer_selectors = [
-                "#answers .answer:first-of-type",
-                ".answer.js-answer:first-of-type",
-                "[data-answerid]:first-of-type",
-                "#answer-8114405"  # fallback for specific answer ID pattern
-            ]
-            
-            for selector in answer_selectors:
+            for selector in self._ordered_selectors("answer", ANSWER_SELECTORS):
+                answers = driver.find_elements(By.CSS_SELECTOR, selector)
+                if not answers:
+                    continue
+                self._resolved_selectors["answer"] = selector
+                
                 try:
-                    top_answer = self.driver.find_element(By.CSS_SELECTOR, selector)
+                    top_answer = answers[0]
                     
                     # Check if answer is accepted - updated selectors
-                    try:
-                        accepted_selectors = [
-                            ".js-accepted-answer-indicator",
-                            ".accepted-answer",
-                            "[class*='accepted']"
-                        ]
-                        for acc_sel in accepted_selectors:
-                            accepted_check = top_answer.find_element(By.CSS_SELECTOR, acc_sel)
-                            # Check if it's visible (not d-none)
-                            if "d-none" not in accepted_check.get_attribute("class"):
-                                full_data["top_answer_accepted"] = True
-                                break
-                    except:
-                        pass
-                    
-                    # Get answer votes - updated selectors for current structure
-                    vote_selectors = [
-                        ".js-vote-count[data-value]",
-                        ".votecell .js-vote-count",
-                        "[data-score]",
-                        ".js-voting-container .js-vote-count"
-                    ]
-                    
-                    for vote_sel in vote_selectors:
-                        try:
-                            vote_element = top_answer.find_element(By.CSS_SELECTOR, vote_sel)
-                            vote_value = vote_element.get_attribute("data-value") or vote_element.text.strip()
-                            if vote_value:
-                                full_data["top_answer_votes"] = vote_value
-                                break
-                        except:
-                            continue
-                    
-                    # Get answer content - updated selectors for current structure
-                    answer_content_selectors = [
-                        ".answercell .s-prose.js-post-body",
-                        ".post-layout--right .s-prose.js-post-body",
-                        ".s-prose.js-post-body",
-                        ".answercell .post-text"
-                    ]
+                    for acc_sel in ANSWER_ACCEPTED_SELECTORS:
+                        accepted_checks = top_answer.find_elements(By.CSS_SELECTOR, acc_sel)
+                        # Check if it's visible (not d-none)
+                        if accepted_checks and "d-none" not in (accepted_checks[0].get_attribute("class") or ""):
+                            full_data["top_answer_accepted"] = True
+                            break
                     
-                    for content_sel in answer_content_selectors:
-                        try:
-                            answer_body = top_answer.find_element(By.CSS_SELECTOR, content_sel)
-                            full_data["top_answer_content"] = answer_body.text.strip()
-                            
-                            # Extract code blocks from answer - updated selectors
-                            code_selectors = [
-                                "pre.lang-py code",  # Python-specific code blocks
-                                "pre code",
-                                "code.hljs",
-                                ".s-code-block code"
-                            ]
-                            
-                            all_code_blocks = []
-                            for code_sel in code_selectors:
-                                try:
-                                    code_elements = answer_body.find_elements(By.CSS_SELECTOR, code_sel)
-                                    for code_elem in code_elements:
-                                        code_text = code_elem.text.strip()
-                                        if code_text and code_text not in all_code_blocks:
-                                            all_code_blocks.append(code_text)
-                                except:
-                                    continue
-                            
-                            full_data["top_answer_code"] = all_code_blocks
+                    # Get answer votes - updated selectors for current structure, grouped into one query
+                    for vote_element in top_answer.find_elements(By.CSS_SELECTOR, ANSWER_VOTE_SELECTOR):
+                        vote_value = vote_element.get_attribute("data-value") or self._text_content(vote_element)
+                        if vote_value:
+                            full_data["top_answer_votes"] = vote_value
                             break
-                        except:
-                            continue
+                    
+                    # Get answer content - updated selectors for current structure, grouped into one query
+                    answer_body = self._first_element(top_answer, ANSWER_BODY_SELECTOR)
+                    if answer_body is not None:
+                        full_data["top_answer_content"] = self._text_content(answer_body)
+                        
+                        # Extract code blocks from answer - updated selectors
+                        full_data["top_answer_code"] = self._element_code_blocks(answer_body, ANSWER_CODE_SELECTOR)
                     
                     # If we found the answer element but no content, try alternative extraction
                     if not full_data["top_answer_content"]:
-                        try:
-                            # Try getting all text from the answer cell
-                            answer_cell = top_answer.find_element(By.CSS_SELECTOR, ".answercell, .post-layout--right")
-                            full_text = answer_cell.text.strip()
-                            if full_text:
-                                # Split by common answer section separators and take the main content
-                                main_content = full_text.split("Share")[0].split("Improve")[0].split("Follow")[0]
-                                full_data["top_answer_content"] = main_content.strip()
-                        except:
-                            pass
+                        # Try getting all text from the answer cell
+                        answer_cell = self._first_element(top_answer, ".answercell, .post-layout--right")
+                        full_text = answer_cell.text.strip() if answer_cell is not None else ""
+                        if full_text:
+                            # Split by common answer section separators and take the main content
+                            main_content = full_text.split("Share")[0].split("Improve")[0].split("Follow")[0]
+                            full_data["top_answer_content"] = main_content.strip()
                     
                     print(f"    ✅ Found answer with {full_data['top_answer_votes']} votes")
                     if full_data["top_answer_accepted"]:
@@ -597,33 +1125,19 @@ class StackOverflowScraper:
         
         return full_data
     
-    def _safe_extract_text(self, parent_element, selectors: List[str], default: str = "N/A") -> str:
+    def _first_element(self, parent_element, selectors: str):
         """
-        Safely extract text using multiple selectors
+        Find the first element matching a grouped CSS selector
         
         Args:
-            parent_element: Parent WebElement to search within
-            selectors: List of CSS selectors to try
-            default: Default value if extraction fails
+            parent_element: Driver or WebElement to search within
+            selectors: Comma-separated CSS selectors, queried in a single round-trip
             
         Returns:
-            Extracted text or default value
+            The first matching WebElement in document order, or None
         """
-        for selector in selectors:
-            try:
-                element = parent_element.find_element(By.CSS_SELECTOR, selector)
-                # Try different text extraction methods
-                text = element.text.strip()
-                if not text:
-                    text = element.get_attribute('textContent').strip() if element.get_attribute('textContent') else ""
-                if not text:
-                    text = element.get_attribute('innerHTML').strip() if element.get_attribute('innerHTML') else ""
-                if text:
-                    return text
-            except Exception as e:
-                # Uncomment for debugging: print(f"Selector '{selector}' failed: {str(e)}")
-                continue
-        return default
+        elements = parent_element.find_elements(By.CSS_SELECTOR, selectors)
+        return elements[0] if elements else None
     
     def save_to_json(self, data: List[Dict], filename: str = None) -> str:
         """Save data to JSON file"""
@@ -632,8 +1146,8 @@ class StackOverflowScraper:
             filename = f"stackoverflow_enhanced_questions_{timestamp}.json"
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             print(f"✅ Enhanced data saved to {filename}")
             print(f"📊 File includes full question content, code blocks, and top answers")
             print(f"📈 Total questions saved: {len(data)}")
@@ -648,8 +1162,8 @@ class StackOverflowScraper:
             # Try to read existing file
             existing_data = []
             try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
+                with open(filename, 'rb') as f:
+                    existing_data = orjson.loads(f.read())
             except (FileNotFoundError, json.JSONDecodeError):
                 existing_data = []
             
@@ -660,8 +1174,8 @@ class StackOverflowScraper:
             existing_data.append(formatted_question)
             
             # Save back to file
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(existing_data, option=orjson.OPT_INDENT_2))
             
             print(f"  💾 Saved question {len(existing_data)} to {filename}")
             return True
@@ -864,7 +1378,8 @@ class StackOverflowScraper:
             print(f"💾 Persistent data in: {self.persistent_json_file}")
             
             # Initialize driver once
-            self.driver = self.setup_driver()
+            if self.use_browser:
+                self.driver = self.setup_driver()
             
             while len(all_questions) < max_questions_total and (current_page - start_page) < max_pages:
                 print(f"\n{'='*80}")
@@ -896,12 +1411,6 @@ class StackOverflowScraper:
                 
                 # Move to next page
                 current_page += 1
-                
-                # Add delay between pages
-                if current_page <= start_page + max_pages:
-                    delay = random.uniform(2, 4)
-                    print(f"⏰ Waiting {delay:.1f}s before next page...")
-                    time.sleep(delay)
             
             if all_questions:
                 print(f"\n✅ Continuous scraping completed! Session: {len(all_questions)} new questions")
@@ -921,7 +1430,7 @@ class StackOverflowScraper:
                 print(f"📊 Total questions in database: {len(self.persistent_data)}")
             
             # Keep browser open briefly if not headless
-            if not self.headless and all_questions:
+            if self.driver and not self.headless and all_questions:
                 print("\nKeeping browser open for 3 seconds...")
                 time.sleep(3)
                 
@@ -929,7 +1438,10 @@ class StackOverflowScraper:
             print(f"❌ Continuous scraping failed: {str(e)}")
             
         finally:
-            self.cleanup()
+            if self.reuse_driver and self.driver:
+                self._reset_session()
+            else:
+                self.cleanup()
         
         return all_questions
     
@@ -938,7 +1450,8 @@ class StackOverflowScraper:
                max_questions: int = 10,
                save_json: bool = True,
                save_csv: bool = False,
-               display_results: bool = True) -> List[Dict]:
+               display_results: bool = True,
+               output_format: str = "json") -> List[Dict]:
         """
         Single page scraping method (legacy)
         
@@ -948,6 +1461,7 @@ class StackOverflowScraper:
             save_json: Save results to JSON file
             save_csv: Save results to CSV file
             display_results: Print results to console
+            output_format: "json" writes one array at the end, "jsonl" appends each question as it is scraped
             
         Returns:
             List of scraped question data
@@ -961,12 +1475,18 @@ class StackOverflowScraper:
             print(f"Headless mode: {self.headless}")
             
             # Initialize driver
-            self.driver = self.setup_driver()
+            if self.use_browser:
+                self.driver = self.setup_driver()
             
             # Navigate to Stack Overflow
             if not self.navigate_to_stackoverflow(url):
                 return questions
             
+            if save_json and output_format == "jsonl":
+                jsonl_filename = f"stackoverflow_enhanced_questions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+                self._jsonl_file = open(jsonl_filename, "ab")
+                print(f"💾 Streaming questions to {jsonl_filename}")
+            
             # Extract questions
             questions = self.extract_questions(max_questions)
             
@@ -978,7 +1498,7 @@ class StackOverflowScraper:
                     self.print_results(questions)
                 
                 # Save to files
-                if save_json:
+                if save_json and self._jsonl_file is None:
                     self.save_to_json(questions)
                 if save_csv:
                     self.save_to_csv(questions)
@@ -986,7 +1506,7 @@ class StackOverflowScraper:
                 print("❌ No questions were extracted")
             
             # Keep browser open briefly if not headless
-            if not self.headless and questions:
+            if self.driver and not self.headless and questions:
                 print("\nKeeping browser open for 3 seconds...")
                 time.sleep(3)
                 
@@ -994,18 +1514,50 @@ class StackOverflowScraper:
             print(f"❌ Scraping failed: {str(e)}")
             
         finally:
-            self.cleanup()
+            if self._jsonl_file is not None:
+                self._jsonl_file.close()
+                self._jsonl_file = None
+            if self.reuse_driver and self.driver:
+                self._reset_session()
+            else:
+                self.cleanup()
         
         return questions
     
     def cleanup(self):
         """Clean up resources"""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+        
+        if self._async_client is not None:
+            self._event_loop.run_until_complete(self._async_client.aclose())
+            self._event_loop.close()
+            self._async_client = None
+            self._event_loop = None
+        
+        for driver in self._pool_drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Warning: Error closing pooled browser: {str(e)}")
+        self._pool_drivers = []
+        self._driver_pool = None
+        
         if self.driver:
             try:
                 self.driver.quit()
                 print("🧹 Browser closed successfully")
             except Exception as e:
                 print(f"Warning: Error closing browser: {str(e)}")
+            self.driver = None
+            self.wait = None
+        self._driver_profiles.clear()
+        self._pages_on_driver.clear()
+        
+        if self._profile_root is not None:
+            shutil.rmtree(self._profile_root, ignore_errors=True)
+            self._profile_root = None
 
 
 def main():
@@ -2,69 +2,63 @@
 Test script to verify answer count extraction from Stack Overflow HTML
 """
 
-from selenium import webdriver
+import pytest
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
 
-def test_answer_extraction():
+# Keep the browser tests on one xdist worker so they share its session browser
+pytestmark = pytest.mark.xdist_group("selenium")
+
+# Answer count selectors combined into one group so a single lookup covers both layouts
+ANSWER_COUNT_SELECTOR = (
+    ".s-post-summary--stats-item[title*='answer'] .s-post-summary--stats-item-number, "
+    ".s-post-summary--stats-item:nth-child(2) .s-post-summary--stats-item-number"
+)
+
+def test_answer_extraction(shared_driver):
     """Test answer count extraction from actual SO HTML structure"""
     
-    # Set up headless Chrome
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    
-    driver = webdriver.Chrome(options=chrome_options)
+    driver = shared_driver
     
     try:
         # Navigate to Stack Overflow
         driver.get("https://stackoverflow.com")
-        time.sleep(3)
         
-        # Find questions
-        questions = driver.find_elements(By.CSS_SELECTOR, ".s-post-summary")
+        # Find questions, waiting only until the listing has rendered
+        questions = WebDriverWait(driver, 10).until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".s-post-summary"))
+        )
         
         print(f"Found {len(questions)} questions")
         
-        for i, question in enumerate(questions[:5]):  # Test first 5 questions
-            try:
-                # Try different selectors for answer count
-                selectors_to_test = [
-                    ".s-post-summary--stats-item[title*='answer'] .s-post-summary--stats-item-number",
-                    ".s-post-summary--stats-item:nth-child(2) .s-post-summary--stats-item-number",
-                ]
-                
-                answer_count = "N/A"
-                used_selector = "None"
-                
-                for selector in selectors_to_test:
-                    try:
-                        element = question.find_element(By.CSS_SELECTOR, selector)
-                        answer_count = element.text.strip()
-                        used_selector = selector
-                        break
-                    except:
-                        continue
-                
-                # Get title for context
-                try:
-                    title_element = question.find_element(By.CSS_SELECTOR, "h3.s-post-summary--content-title a")
-                    title = title_element.text.strip()[:50] + "..."
-                except:
-                    title = "Unknown title"
-                
-                print(f"Question {i+1}: {title}")
-                print(f"  Answer count: {answer_count} (using: {used_selector})")
-                print(f"  Will be {'SKIPPED' if answer_count == '0' else 'PROCESSED'}")
-                print("-" * 60)
-                
-            except Exception as e:
-                print(f"Error processing question {i+1}: {e}")
+        # Read the first 5 questions in one round-trip instead of several lookups per question
+        rows = driver.execute_script("""
+            const selector = arguments[0];
+            return Array.from(document.querySelectorAll('.s-post-summary')).slice(0, 5).map(q => {
+                const node = q.querySelector(selector);
+                const t = q.querySelector('h3.s-post-summary--content-title a');
+                return {answers: node ? node.innerText.trim() : 'N/A',
+                        title: t ? t.innerText.trim().slice(0, 50) + '...' : 'Unknown title'};
+            });
+        """, ANSWER_COUNT_SELECTOR)
+        
+        for i, row in enumerate(rows):  # Test first 5 questions
+            answer_count = row["answers"]
+            print(f"Question {i+1}: {row['title']}")
+            print(f"  Answer count: {answer_count}")
+            print(f"  Will be {'SKIPPED' if answer_count == '0' else 'PROCESSED'}")
+            print("-" * 60)
     
     finally:
-        driver.quit()
+        # Leave the shared browser on a blank page for the next test
+        driver.get("about:blank")
 
 if __name__ == "__main__":
-    test_answer_extraction()
\ No newline at end of file
+    from conftest import create_test_driver
+    
+    driver = create_test_driver()
+    try:
+        test_answer_extraction(driver)
+    finally:
+        driver.quit()
\ No newline at end of file
@@ -3,130 +3,142 @@ Unit test for enhanced Stack Overflow scraper - Single Question Test
 Tests the scraper's capability to extract full content from a specific question
 """
 
-import unittest
-import json
+from pathlib import Path
+import orjson
+import pytest
 from scraper import StackOverflowScraper
 
+# Keep the browser tests on one xdist worker so they share its session browser
+pytestmark = pytest.mark.xdist_group("selenium")
 
-class TestSingleQuestionScraper(unittest.TestCase):
-    """Test class for single question scraping functionality"""
-    
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.scraper = StackOverflowScraper(
-            headless=False,  # Set to True to run silently
-            timeout=20
-        )
-        self.test_url = "https://stackoverflow.com/questions/8114355/loop-until-a-specific-user-input?noredirect=1&lq=1"
-        
-    def tearDown(self):
-        """Tear down test fixtures after each test method."""
-        if self.scraper:
-            self.scraper.cleanup()
-    
-    def test_scrape_full_question_content(self):
-        """Test scraping full question and answer content from specific URL"""
-        print(f"\n🧪 Testing enhanced scraper on specific question:")
-        print(f"📍 URL: {self.test_url}")
-        print("=" * 80)
+TEST_URL = "https://stackoverflow.com/questions/8114355/loop-until-a-specific-user-input?noredirect=1&lq=1"
+
+
+@pytest.fixture(scope="module")
+def scraper():
+    """One scraper for the module, cleaned up once after its last test"""
+    # The shared browser is passed per call rather than assigned, so cleanup leaves it open
+    s = StackOverflowScraper(timeout=20)
+    yield s
+    s.cleanup()
+
+
+@pytest.fixture
+def log(pytestconfig):
+    """print under pytest -v, otherwise a no-op so quiet runs skip the progress output"""
+    if pytestconfig.getoption("verbose") > 0:
+        return print
+    return lambda *args, **kwargs: None
+
+
+def test_scrape_full_question_content(scraper, shared_driver, tmp_path, log):
+    """Test scraping full question and answer content from specific URL"""
+    log(f"\n🧪 Testing enhanced scraper on specific question:")
+    log(f"📍 URL: {TEST_URL}")
+    log("=" * 80)
+    
+    # Extract full content using the enhanced method on the shared browser
+    log("📊 Extracting full question and answer content...")
+    full_data = scraper.scrape_full_question_and_answer(TEST_URL, shared_driver)
+    
+    # Verify we got data
+    assert isinstance(full_data, dict), "Should return a dictionary"
+    
+    # Test question content extraction
+    log(f"\n📝 Question Content Length: {len(full_data.get('question_content', ''))}")
+    if full_data.get('question_content'):
+        log(f"✅ Question content extracted successfully")
+        log(f"🔤 Preview: {full_data['question_content'][:200]}...")
+    else:
+        log("❌ No question content found")
+    
+    # Test question code blocks
+    question_code_count = len(full_data.get('question_code', []))
+    log(f"\n💻 Question Code Blocks: {question_code_count}")
+    if question_code_count > 0:
+        log("✅ Code blocks found in question")
+        for i, code in enumerate(full_data['question_code'][:2], 1):  # Show first 2
+            log(f"   Code Block {i}: {code[:100]}...")
+    
+    # Test top answer extraction
+    log(f"\n🎯 Top Answer Content Length: {len(full_data.get('top_answer_content', ''))}")
+    if full_data.get('top_answer_content'):
+        log(f"✅ Top answer extracted successfully")
+        log(f"📊 Answer Votes: {full_data.get('top_answer_votes', 'N/A')}")
+        log(f"✅ Accepted: {full_data.get('top_answer_accepted', False)}")
+        log(f"🔤 Preview: {full_data['top_answer_content'][:200]}...")
+    else:
+        log("❌ No top answer content found")
+    
+    # Test answer code blocks
+    answer_code_count = len(full_data.get('top_answer_code', []))
+    log(f"\n💻 Answer Code Blocks: {answer_code_count}")
+    if answer_code_count > 0:
+        log("✅ Code blocks found in answer")
+        for i, code in enumerate(full_data['top_answer_code'][:2], 1):  # Show first 2
+            log(f"   Code Block {i}: {code[:100]}...")
+    
+    # Save test results to JSON
+    timestamp = "test_single"
+    filename = f"test_question_data_{timestamp}.json"
+    
+    # Create complete question data structure for testing
+    complete_question_data = {
+        "index": 1,
+        "title": "Asking the user for input until they give a valid response",
+        "link": TEST_URL,
+        "votes": "extracted_from_page",
+        "answers": "extracted_from_page", 
+        "views": "extracted_from_page",
+        "tags": ["extracted_from_page"],
+        "author": "extracted_from_page",
+        "excerpt": "Test question for validation",
+        "timestamp": "test_run",
+        "scraped_at": "test_timestamp"
+    }
+    
+    # Merge with extracted content
+    complete_question_data.update(full_data)
+    
+    # Save to file
+    output_path = tmp_path / filename
+    output_path.write_bytes(
+        orjson.dumps([complete_question_data], option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    )
+    
+    log(f"\n💾 Test results saved to: {output_path}")
+    
+    # Assertions
+    assert len(full_data.get('question_content', '')) > 0, "Question content should not be empty"
+    
+    assert len(full_data.get('top_answer_content', '')) > 0, "Top answer content should not be empty"
+    
+    # This specific question should have code blocks
+    assert len(full_data.get('question_code', [])) > 0, "This question should contain code blocks"
+    
+    assert len(full_data.get('top_answer_code', [])) > 0, "The top answer should contain code blocks"
+    
+    log(f"\n🎉 All tests passed! Scraper successfully extracted full content.")
+
+
+def test_parallel_question_pages(log):
+    """Browser-mode question pages load on parallel_pages pooled drivers, in listing order"""
+    pooled = StackOverflowScraper(headless=True, timeout=20, use_browser=True, parallel_pages=2)
+    questions = [
+        {"index": i, "title": f"Question {i}", "question_id": "8114355", "link": TEST_URL}
+        for i in range(1, 4)
+    ]
+    
+    try:
+        log(f"\n🚗 Loading {len(questions)} question pages on {pooled.parallel_pages} browsers...")
+        results = pooled._scrape_full_contents(questions)
         
-        try:
-            # Initialize driver
-            self.scraper.driver = self.scraper.setup_driver()
-            
-            # Navigate directly to the question
-            print("🌐 Navigating to question page...")
-            self.scraper.driver.get(self.test_url)
-            
-            # Extract full content using the enhanced method
-            print("📊 Extracting full question and answer content...")
-            full_data = self.scraper.scrape_full_question_and_answer(self.test_url)
-            
-            # Verify we got data
-            self.assertIsInstance(full_data, dict, "Should return a dictionary")
-            
-            # Test question content extraction
-            print(f"\n📝 Question Content Length: {len(full_data.get('question_content', ''))}")
-            if full_data.get('question_content'):
-                print(f"✅ Question content extracted successfully")
-                print(f"🔤 Preview: {full_data['question_content'][:200]}...")
-            else:
-                print("❌ No question content found")
-            
-            # Test question code blocks
-            question_code_count = len(full_data.get('question_code', []))
-            print(f"\n💻 Question Code Blocks: {question_code_count}")
-            if question_code_count > 0:
-                print("✅ Code blocks found in question")
-                for i, code in enumerate(full_data['question_code'][:2], 1):  # Show first 2
-                    print(f"   Code Block {i}: {code[:100]}...")
-            
-            # Test top answer extraction
-            print(f"\n🎯 Top Answer Content Length: {len(full_data.get('top_answer_content', ''))}")
-            if full_data.get('top_answer_content'):
-                print(f"✅ Top answer extracted successfully")
-                print(f"📊 Answer Votes: {full_data.get('top_answer_votes', 'N/A')}")
-                print(f"✅ Accepted: {full_data.get('top_answer_accepted', False)}")
-                print(f"🔤 Preview: {full_data['top_answer_content'][:200]}...")
-            else:
-                print("❌ No top answer content found")
-            
-            # Test answer code blocks
-            answer_code_count = len(full_data.get('top_answer_code', []))
-            print(f"\n💻 Answer Code Blocks: {answer_code_count}")
-            if answer_code_count > 0:
-                print("✅ Code blocks found in answer")
-                for i, code in enumerate(full_data['top_answer_code'][:2], 1):  # Show first 2
-                    print(f"   Code Block {i}: {code[:100]}...")
-            
-            # Save test results to JSON
-            timestamp = "test_single"
-            filename = f"test_question_data_{timestamp}.json"
-            
-            # Create complete question data structure for testing
-            complete_question_data = {
-                "index": 1,
-                "title": "Asking the user for input until they give a valid response",
-                "link": self.test_url,
-                "votes": "extracted_from_page",
-                "answers": "extracted_from_page", 
-                "views": "extracted_from_page",
-                "tags": ["extracted_from_page"],
-                "author": "extracted_from_page",
-                "excerpt": "Test question for validation",
-                "timestamp": "test_run",
-                "scraped_at": "test_timestamp"
-            }
-            
-            # Merge with extracted content
-            complete_question_data.update(full_data)
-            
-            # Save to file
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump([complete_question_data], f, indent=2, ensure_ascii=False)
-            
-            print(f"\n💾 Test results saved to: {filename}")
-            
-            # Assertions
-            self.assertGreater(len(full_data.get('question_content', '')), 0, 
-                             "Question content should not be empty")
-            
-            self.assertGreater(len(full_data.get('top_answer_content', '')), 0,
-                             "Top answer content should not be empty")
-            
-            # This specific question should have code blocks
-            self.assertGreater(len(full_data.get('question_code', [])), 0,
-                             "This question should contain code blocks")
-            
-            self.assertGreater(len(full_data.get('top_answer_code', [])), 0,
-                             "The top answer should contain code blocks")
-            
-            print(f"\n🎉 All tests passed! Scraper successfully extracted full content.")
-            
-            return full_data
-            
-        except Exception as e:
-            self.fail(f"Test failed with error: {str(e)}")
+        assert len(pooled._pool_drivers) == 2, "One pooled browser should start per parallel page"
+        assert len(results) == len(questions), "Every question should get its full content"
+        for full_data in results:
+            assert len(full_data.get('question_content', '')) > 0, "Question content should not be empty"
+    finally:
+        pooled.cleanup()
 
 
 def run_single_test():
@@ -134,27 +146,29 @@ def run_single_test():
     print("🧪 Stack Overflow Enhanced Scraper - Single Question Test")
     print("=" * 80)
     
-    # Create test instance
-    test = TestSingleQuestionScraper()
-    test.setUp()
+    from conftest import create_test_driver
+    
+    driver = create_test_driver()
+    scraper = StackOverflowScraper(timeout=20)
     
     try:
         # Run the test
-        result = test.test_scrape_full_question_content()
+        test_scrape_full_question_content(scraper, driver, Path("."), print)
         print(f"\n✅ Test completed successfully!")
         
     except Exception as e:
         print(f"\n❌ Test failed: {str(e)}")
         
     finally:
-        test.tearDown()
+        scraper.cleanup()
+        driver.quit()
 
 
 if __name__ == "__main__":
     # You can run this in two ways:
     
-    # Option 1: Run as unit test
-    # unittest.main()
+    # Option 1: Run under pytest
+    # pytest test_single_question.py
     
     # Option 2: Run direct test with detailed output
     run_single_test()
\ No newline at end of file